@@ -1,43 +1,197 @@
 """
 Authentication Module - Handle login and session management with browser support
 """
+import functools
 import os
+import re
 import shutil
 import time
 import platform
 from typing import Optional, Dict, Tuple
 
 import requests
-from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options as ChromeOptions
-from selenium.webdriver.chrome.service import Service as ChromeService
-from selenium.webdriver.common.by import By
-from selenium.webdriver.firefox.options import Options as FirefoxOptions
-from selenium.webdriver.firefox.service import Service as FirefoxService
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
-from webdriver_manager.chrome import ChromeDriverManager
-from webdriver_manager.firefox import GeckoDriverManager
+from requests.cookies import create_cookie
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, SoupStrainer
 
 from utils.csrf import extract_csrf_token, extract_csrf_from_form
 from utils.forms import parse_forms, is_login_form, has_logout_indicator
 
+# Prefer the lxml C parser when available - it is several times faster than
+# the pure-Python html.parser on typical login pages
+try:
+    import lxml  # noqa: F401
+    _PARSER = 'lxml'
+except ImportError:
+    _PARSER = 'html.parser'
+
+# Optional: selectolax (Lexbor C parser) locates logout/dashboard links in
+# very large bodies faster than a regex pass over the full text
+try:
+    from selectolax.parser import HTMLParser as _SelectolaxParser
+except ImportError:
+    _SelectolaxParser = None
+
+# Body size above which the selectolax element scan beats the regex scan
+_LARGE_BODY_CHARS = 512 * 1024
+
+_AUTH_INDICATOR_CSS = 'a[href*="logout"], a[href*="signout"], a[href*="dashboard"]'
+
+# Only build tree nodes for <form> subtrees when hunting for the CSRF field -
+# scripts, styles and page content never materialize as Python objects
+_FORM_STRAINER = SoupStrainer('form')
+
+# Fast path for CSRF field discovery: most login pages use an obvious
+# name like csrf_token/authenticity_token, findable without an HTML parse
+_CSRF_INPUT_RE = re.compile(
+    r'<input\b[^>]*\bname=["\']?'
+    r'([A-Za-z0-9_\-]*(?:csrf|token|authenticity)[A-Za-z0-9_\-]*)["\']?',
+    re.I
+)
+
+@functools.lru_cache(maxsize=1)
+def _gecko_driver_path() -> str:
+    """Resolve (and cache) the geckodriver path via webdriver-manager"""
+    from webdriver_manager.firefox import GeckoDriverManager
+    return GeckoDriverManager().install()
+
+
+@functools.lru_cache(maxsize=1)
+def _chrome_driver_path() -> str:
+    """Resolve (and cache) the chromedriver path via webdriver-manager"""
+    from webdriver_manager.chrome import ChromeDriverManager
+    return ChromeDriverManager().install()
+
+
+# Single multi-pattern scan for authenticated-page indicators - one pass
+# over the body instead of one substring search per indicator, and the
+# case-insensitive flag avoids a full lowercase copy of the body
+_AUTH_INDICATOR_RE = re.compile(
+    r'dashboard|profile|account|welcome|logout|sign ?out|my account', re.I
+)
+
 
 class AuthenticationError(Exception):
     """Raised when authentication fails"""
     pass
 
 
+class _Http2RawBody:
+    """Buffer exposing the urllib3 raw.read interface over fetched content"""
+
+    def __init__(self, content: bytes):
+        import io
+        self._buf = io.BytesIO(content)
+
+    def read(self, amt=None, decode_content=True):
+        return self._buf.read(amt)
+
+
+class _Http2Response:
+    """Adapt an httpx.Response to the requests surface used in this package"""
+
+    def __init__(self, resp):
+        self._resp = resp
+        self.status_code = resp.status_code
+        self.url = str(resp.url)
+        self.headers = resp.headers
+        self.encoding = resp.encoding
+        self.ok = resp.status_code < 400
+        self.raw = _Http2RawBody(resp.content)
+
+    @property
+    def text(self) -> str:
+        return self._resp.text
+
+    def close(self):
+        self._resp.close()
+
+
+class _Http2CookieJar:
+    """Adapt httpx.Cookies to the RequestsCookieJar calls used here"""
+
+    def __init__(self, cookies):
+        self._cookies = cookies
+
+    def set(self, name, value, domain='', path='/'):
+        self._cookies.set(name, value, domain=domain, path=path)
+
+    def set_cookie(self, cookie):
+        self._cookies.set(cookie.name, cookie.value,
+                          domain=cookie.domain or '', path=cookie.path or '/')
+
+    def get_dict(self):
+        return dict(self._cookies)
+
+    def __iter__(self):
+        # The crawler iterates the session jar to seed aiohttp with
+        # scoped cookies; the underlying http.cookiejar entries carry
+        # the .name/.value/.domain/.path attributes it reads
+        return iter(self._cookies.jar)
+
+
+class _Http2Session:
+    """
+    Minimal requests.Session-compatible facade over httpx.Client(http2=True)
+
+    HTTP/2 multiplexes the many small requests the crawler and scanner
+    issue against one host over a single connection, removing
+    head-of-line blocking between them.
+    """
+
+    def __init__(self):
+        import httpx
+        self._httpx = httpx
+        self._client = httpx.Client(http2=True, timeout=10)
+        self.headers = self._client.headers
+        self.cookies = _Http2CookieJar(self._client.cookies)
+
+    def mount(self, prefix, adapter):
+        """Accept requests-style adapter mounts as a no-op
+
+        The scanner tunes pool sizing/retries through HTTPAdapter on the
+        session it receives; httpx manages its own transport pool, so
+        there is nothing to apply here - but the call must not crash.
+        """
+
+    def request(self, method, url, timeout=None, allow_redirects=True,
+                stream=False, **kwargs):
+        # stream is accepted for API compatibility; the capped read is
+        # applied by the caller via the .raw buffer
+        try:
+            resp = self._client.request(method, url, timeout=timeout,
+                                        follow_redirects=allow_redirects,
+                                        **kwargs)
+        except self._httpx.HTTPError as e:
+            # Surface failures as the exception type the rest of the
+            # package already handles
+            raise requests.exceptions.RequestException(str(e)) from e
+        return _Http2Response(resp)
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def head(self, url, **kwargs):
+        return self.request('HEAD', url, **kwargs)
+
+    def close(self):
+        self._client.close()
+
+
 class Authenticator:
     """Handles authentication and session management with browser support"""
     
-    def __init__(self, login_url: str, username: str = "", password: str = "", 
-                 base_url: str = "", logger=None, use_browser: bool = True, 
-                 browser_choice: str = "firefox"):
+    def __init__(self, login_url: str, username: str = "", password: str = "",
+                 base_url: str = "", logger=None, use_browser: bool = True,
+                 browser_choice: str = "firefox", confirm_login: bool = False,
+                 max_body_bytes: int = 262144, use_http2: bool = False):
         """
         Initialize authenticator
-        
+
         Args:
             login_url: URL of the login page
             username: Username for authentication (optional for browser mode)
@@ -46,15 +200,56 @@ class Authenticator:
             logger: Logger instance for output
             use_browser: Whether to use browser-based manual login
             browser_choice: Browser to use ('firefox', 'chrome')
+            confirm_login: Ask for manual confirmation after browser login
+                is detected (instead of proceeding automatically)
+            max_body_bytes: Cap on how much of a response body is read
+                during automated login (forms and indicators live near the
+                top of the page; this bounds memory on bloated pages)
+            use_http2: Use an HTTP/2 (httpx) session when httpx is
+                installed; falls back to requests otherwise
         """
         self.login_url = login_url
         self.username = username
         self.password = password
         self.base_url = base_url or login_url
+        # Lowercase forms are compared on every verification/validity check
+        self._login_url_lower = self.login_url.lower()
+        self._base_url_lower = self.base_url.lower()
         self.logger = logger
+        # Resolve logger methods once; _log becomes a dict lookup per call
+        self._log_dispatch = {} if not logger else {
+            'info': logger.info,
+            'success': logger.success,
+            'error': logger.error,
+            'warning': logger.warning,
+        }
         self.use_browser = use_browser
         self.browser_choice = browser_choice.lower()
-        self.session = requests.Session()
+        self.confirm_login = confirm_login
+        self.max_body_bytes = max_body_bytes
+        self.session = None
+        if use_http2:
+            try:
+                self.session = _Http2Session()
+            except ImportError:
+                self._log("warning", "httpx (with h2) not installed, falling back to HTTP/1.1")
+
+        if self.session is None:
+            self.session = requests.Session()
+            # Size the connection pool for the crawl/scan phases that reuse
+            # this session, and retry transient server errors instead of
+            # failing fast. Defaults (pool_maxsize=10, no retries) exhaust
+            # the pool and force fresh TLS handshakes once the scanner
+            # fans out.
+            retry = Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=(500, 502, 503, 504),
+                allowed_methods=frozenset(['GET', 'HEAD', 'POST'])
+            )
+            adapter = HTTPAdapter(pool_connections=20, pool_maxsize=100, max_retries=retry)
+            self.session.mount('https://', adapter)
+            self.session.mount('http://', adapter)
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
         })
@@ -82,15 +277,9 @@ class Authenticator:
     
     def _log(self, level: str, message: str):
         """Internal logging helper"""
-        if self.logger:
-            if level == "info":
-                self.logger.info(message)
-            elif level == "success":
-                self.logger.success(message)
-            elif level == "error":
-                self.logger.error(message)
-            elif level == "warning":
-                self.logger.warning(message)
+        fn = self._log_dispatch.get(level)
+        if fn:
+            fn(message)
     
     def authenticate(self) -> requests.Session:
         """
@@ -113,6 +302,13 @@ class Authenticator:
         Open browser for manual login and capture session cookies
         Handles complex authentication: multi-step, OTP, 2FA, etc.
         """
+        # Selenium is only needed for the browser flow - import it here so
+        # automated-login runs never pay its import cost; the browser-specific
+        # submodules load in their branches below
+        from selenium import webdriver
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.common.exceptions import TimeoutException
+
         self._log("info", "Opening browser for manual authentication...")
         self._log("info", "Please complete the login process in the browser window")
         self._log("info", "The browser will close automatically once you're logged in")
@@ -130,6 +326,9 @@ class Authenticator:
         try:
             # Initialize WebDriver based on browser choice
             if self.browser_choice == "firefox":
+                from selenium.webdriver.firefox.options import Options as FirefoxOptions
+                from selenium.webdriver.firefox.service import Service as FirefoxService
+
                 self._log("info", "Initializing Firefox WebDriver...")
                 firefox_options = FirefoxOptions()
                 firefox_options.set_preference('dom.webdriver.enabled', False)
@@ -149,7 +348,7 @@ class Authenticator:
                     try:
                         self._log("info", "Attempting to download ARM64 geckodriver via webdriver-manager...")
                         os.environ.setdefault("WDM_ARCH", "arm64")
-                        service = FirefoxService(GeckoDriverManager().install())
+                        service = FirefoxService(_gecko_driver_path())
                         driver = webdriver.Firefox(service=service, options=firefox_options)
                     except Exception as mgr_err:
                         self._log("error", "Failed to start Firefox WebDriver")
@@ -161,6 +360,9 @@ class Authenticator:
                         raise AuthenticationError(f"Unable to start Firefox WebDriver: {mgr_err}")
 
             elif self.browser_choice == "chrome":
+                from selenium.webdriver.chrome.options import Options as ChromeOptions
+                from selenium.webdriver.chrome.service import Service as ChromeService
+
                 self._log("info", "Initializing Chrome WebDriver...")
                 chrome_options = ChromeOptions()
                 chrome_options.add_argument('--no-sandbox')
@@ -182,7 +384,7 @@ class Authenticator:
                     try:
                         self._log("info", "Attempting to download ARM64 chromedriver via webdriver-manager...")
                         os.environ.setdefault("WDM_ARCH", "arm64")
-                        service = ChromeService(ChromeDriverManager().install())
+                        service = ChromeService(_chrome_driver_path())
                         driver = webdriver.Chrome(service=service, options=chrome_options)
                     except Exception as mgr_err:
                         self._log("error", "Failed to start Chrome WebDriver")
@@ -200,52 +402,47 @@ class Authenticator:
             
             # Wait for user to complete login
             self._log("info", "Waiting for you to complete login...")
-            self._log("warning", "Press Enter here after you've successfully logged in")
-            
-            # Monitor for successful authentication
-            authenticated = False
-            start_time = time.time()
+
+            # Let Selenium poll for authentication instead of busy-waiting:
+            # no per-second page_source transfers, no blocking input() loop
             timeout = 300  # 5 minutes timeout
-            
-            while not authenticated and (time.time() - start_time) < timeout:
-                try:
-                    # Check if URL changed from login page
-                    current_url = driver.current_url.lower()
-                    
-                    # Check for authentication indicators
-                    if 'login' not in current_url or self._check_browser_auth(driver):
-                        # Prompt user to confirm
-                        user_input = input("\n[?] Have you successfully logged in? (Press Enter to continue, 'n' to wait): ").strip().lower()
-                        
-                        if user_input != 'n':
-                            authenticated = True
-                            break
-                    
-                    time.sleep(1)
-                except Exception as e:
-                    time.sleep(1)
-            
-            if not authenticated:
+            try:
+                WebDriverWait(driver, timeout, poll_frequency=0.5).until(
+                    lambda d: 'login' not in d.current_url.lower()
+                    or self._check_browser_auth(d)
+                )
+            except TimeoutException:
                 raise AuthenticationError("Authentication timeout - please try again")
+
+            if self.confirm_login:
+                user_input = input("\n[?] Have you successfully logged in? (Press Enter to continue, 'n' to abort): ").strip().lower()
+                if user_input == 'n':
+                    raise AuthenticationError("Login not confirmed by user")
             
             # Extract cookies from browser
             self._log("info", "Extracting session cookies from browser...")
             cookies = driver.get_cookies()
             
-            # Transfer cookies to requests session
+            # Transfer cookies to requests session. set_cookie inserts
+            # directly instead of rescanning the jar for conflicts on every
+            # cookie the way jar.set() does, keeping the transfer linear
             for cookie in cookies:
-                self.session.cookies.set(
-                    cookie['name'],
-                    cookie['value'],
+                self.session.cookies.set_cookie(create_cookie(
+                    name=cookie['name'],
+                    value=cookie['value'],
                     domain=cookie.get('domain', ''),
                     path=cookie.get('path', '/')
-                )
+                ))
             
-            # Verify session
+            # Verify session - the browser already rendered this page, so a
+            # HEAD round-trip is enough to prove the cookies work; no body
+            # download needed
             self._log("info", "Verifying captured session...")
-            test_response = self.session.get(driver.current_url, timeout=10)
-            
-            if test_response.status_code == 200:
+            test_response = self.session.head(driver.current_url, timeout=10,
+                                              allow_redirects=True)
+
+            if test_response.status_code in (200, 302, 303) and \
+                    'login' not in test_response.url.lower():
                 self._log("success", f"Session captured successfully! {len(cookies)} cookies transferred")
                 return self.session
             else:
@@ -262,12 +459,17 @@ class Authenticator:
     def _check_browser_auth(self, driver) -> bool:
         """Check if browser shows authentication indicators"""
         try:
-            page_source = driver.page_source.lower()
-            return any(indicator in page_source for indicator in [
-                'logout', 'sign out', 'dashboard', 'profile', 'account'
-            ])
-        except:
-            return False
+            # Run the check in the browser itself - avoids marshalling the
+            # full page source over the WebDriver connection on every poll
+            return bool(driver.execute_script(
+                "return /dashboard|profile|account|welcome|logout|sign ?out/i"
+                ".test(document.body.innerText.slice(0, 2000))"
+            ))
+        except Exception:
+            try:
+                return _AUTH_INDICATOR_RE.search(driver.page_source) is not None
+            except Exception:
+                return False
     
     def _automated_authenticate(self) -> requests.Session:
         """
@@ -279,22 +481,33 @@ class Authenticator:
         try:
             # Step 1: Get login page to extract CSRF token and cookies
             self._log("info", "Fetching login page...")
-            response = self.session.get(self.login_url, timeout=10, allow_redirects=True)
-            
+            response = self.session.get(self.login_url, timeout=10,
+                                        allow_redirects=True, stream=True)
+
             if response.status_code != 200:
+                response.close()
                 raise AuthenticationError(f"Failed to fetch login page (Status: {response.status_code})")
-            
+
+            # Read at most max_body_bytes - forms and tokens sit near the
+            # top of the page, so the cap bounds memory on bloated pages
+            body = self._read_body(response)
+
+            # Parse the login page once; CSRF discovery and form parsing
+            # share the same tree instead of each re-parsing the body
+            soup = BeautifulSoup(body, _PARSER)
+
             # Step 2: Extract CSRF token
             self.csrf_token = extract_csrf_token(
-                response.text, 
-                self.session.cookies.get_dict()
+                body,
+                self.session.cookies.get_dict(),
+                soup=soup
             )
-            
+
             if self.csrf_token:
                 self._log("success", f"CSRF token extracted: {self.csrf_token[:20]}...")
-            
+
             # Step 3: Find login form
-            forms = parse_forms(response.text, self.login_url)
+            forms = parse_forms(body, self.login_url, soup=soup)
             login_form = None
             
             for form in forms:
@@ -308,7 +521,7 @@ class Authenticator:
                 self._log("warning", "No obvious login form found, using first form")
             
             # Step 4: Prepare login data
-            login_data = self._prepare_login_data(login_form, response.text)
+            login_data = self._prepare_login_data(login_form, body, soup=soup)
             
             # Determine POST URL
             post_url = login_form.action if login_form else self.login_url
@@ -320,11 +533,12 @@ class Authenticator:
                 post_url,
                 data=login_data,
                 timeout=10,
-                allow_redirects=True
+                allow_redirects=True,
+                stream=True
             )
-            
+
             # Step 6: Verify authentication
-            if self._verify_authentication(response):
+            if self._verify_authentication(response, body=self._read_body(response)):
                 self._log("success", "Authentication successful!")
                 return self.session
             else:
@@ -333,14 +547,32 @@ class Authenticator:
         except requests.exceptions.RequestException as e:
             raise AuthenticationError(f"Network error during authentication: {str(e)}")
     
-    def _prepare_login_data(self, login_form, html_content: str) -> Dict[str, str]:
+    def _read_body(self, response: requests.Response) -> str:
+        """
+        Read a streamed response body, capped at max_body_bytes
+
+        Args:
+            response: Response opened with stream=True
+
+        Returns:
+            Decoded body text (possibly truncated)
+        """
+        try:
+            raw = response.raw.read(self.max_body_bytes, decode_content=True)
+            return raw.decode(response.encoding or 'utf-8', 'replace')
+        finally:
+            response.close()
+
+    def _prepare_login_data(self, login_form, html_content: str,
+                            soup=None) -> Dict[str, str]:
         """
         Prepare login POST data
-        
+
         Args:
             login_form: FormData object or None
             html_content: HTML content of login page
-        
+            soup: Optional pre-parsed BeautifulSoup tree to reuse
+
         Returns:
             Dictionary of form data
         """
@@ -352,12 +584,12 @@ class Authenticator:
         
         # Try to identify username and password fields
         username_field = self._find_field_name(
-            login_data.keys() if login_form else [],
+            login_data,
             ['username', 'user', 'email', 'login', 'userid', 'user_name']
         )
-        
+
         password_field = self._find_field_name(
-            login_data.keys() if login_form else [],
+            login_data,
             ['password', 'pass', 'passwd', 'pwd']
         )
         
@@ -378,44 +610,54 @@ class Authenticator:
         if self.csrf_token:
             # Try to find actual CSRF field name from form
             if login_form:
-                soup = BeautifulSoup(html_content, 'html.parser')
-                forms = soup.find_all('form')
-                for form in forms:
-                    csrf_data = extract_csrf_from_form(form)
-                    if csrf_data:
-                        self.csrf_field_name = csrf_data[0]
-                        login_data[self.csrf_field_name] = self.csrf_token
-                        break
+                # Cheap regex scan first - avoids an HTML parse entirely
+                # when the field uses a conventional name
+                match = _CSRF_INPUT_RE.search(html_content)
+                if match:
+                    self.csrf_field_name = match.group(1)
+                    login_data[self.csrf_field_name] = self.csrf_token
+                else:
+                    if soup is None:
+                        soup = BeautifulSoup(html_content, _PARSER,
+                                             parse_only=_FORM_STRAINER)
+                    for form in soup.find_all('form'):
+                        csrf_data = extract_csrf_from_form(form)
+                        if csrf_data:
+                            self.csrf_field_name = csrf_data[0]
+                            login_data[self.csrf_field_name] = self.csrf_token
+                            break
             else:
                 login_data[self.csrf_field_name] = self.csrf_token
         
         return login_data
     
-    def _find_field_name(self, field_names: list, candidates: list) -> Optional[str]:
+    def _find_field_name(self, field_names, candidates: list) -> Optional[str]:
         """Find matching field name from candidates"""
-        field_names_lower = [f.lower() for f in field_names]
-        
+        # Map lowercase -> original once, then each candidate is an O(1) lookup
+        lower_to_orig = {f.lower(): f for f in field_names}
+
         for candidate in candidates:
-            if candidate in field_names_lower:
-                # Return original case
-                idx = field_names_lower.index(candidate)
-                return list(field_names)[idx]
-        
+            if candidate in lower_to_orig:
+                return lower_to_orig[candidate]
+
         return None
     
-    def _verify_authentication(self, response: requests.Response) -> bool:
+    def _verify_authentication(self, response: requests.Response,
+                               body: Optional[str] = None) -> bool:
         """
         Verify if authentication was successful
-        
+
         Multiple checks:
         1. No redirect back to login page
         2. Presence of logout link
         3. Absence of login form
         4. HTTP status code
-        
+
         Args:
             response: Response object after login POST
-        
+            body: Pre-read (possibly capped) body text; defaults to
+                response.text
+
         Returns:
             True if authenticated, False otherwise
         """
@@ -423,39 +665,43 @@ class Authenticator:
         if response.status_code not in [200, 302, 303]:
             self._log("warning", f"Unexpected status code: {response.status_code}")
             return False
-        
+
         # Check 2: Not redirected back to login
         final_url = response.url.lower()
-        login_url_lower = self.login_url.lower()
-        
-        if 'login' in final_url or final_url == login_url_lower:
+
+        if 'login' in final_url or final_url == self._login_url_lower:
             self._log("error", "Redirected back to login page")
             return False
-        
-        # Check 3: Look for logout indicator
-        if has_logout_indicator(response.text):
+
+        # Decode the body once; the remaining checks scan it repeatedly
+        # and most logins succeed on the cheap ones
+        if body is None:
+            body = response.text
+
+        # Check 3: Check for common authenticated page indicators first -
+        # a raw regex pass is much cheaper than the HTML-parsing checks
+        # below and fires on most real sessions. On very large bodies a
+        # selectolax element lookup is faster still (and ignores indicator
+        # words buried in script strings)
+        if _SelectolaxParser is not None and len(body) > _LARGE_BODY_CHARS:
+            if _SelectolaxParser(body).css_first(_AUTH_INDICATOR_CSS):
+                return True
+        elif _AUTH_INDICATOR_RE.search(body):
             return True
-        
-        # Check 4: Check for absence of login form
-        forms = parse_forms(response.text, response.url)
+
+        # Check 4: Look for logout indicator
+        if has_logout_indicator(body):
+            return True
+
+        # Check 5: Check for absence of login form (most expensive - full
+        # HTML parse - so only when the cheap checks were inconclusive)
+        forms = parse_forms(body, response.url)
         has_login = any(is_login_form(form) for form in forms)
-        
+
         if has_login:
             self._log("error", "Login form still present after authentication")
             return False
-        
-        # Check 5: Check for common authenticated page indicators
-        authenticated_indicators = [
-            'dashboard', 'profile', 'account', 'welcome',
-            'logout', 'signout', 'my account'
-        ]
-        
-        content_lower = response.text.lower()
-        has_indicator = any(indicator in content_lower for indicator in authenticated_indicators)
-        
-        if has_indicator:
-            return True
-        
+
         # If we got here and didn't fail previous checks, consider it successful
         # (Some apps don't have obvious indicators)
         self._log("warning", "Could not definitively verify authentication, assuming success")
@@ -473,17 +719,30 @@ class Authenticator:
         """
         if not test_url:
             test_url = self.base_url
-        
+
         try:
+            # HEAD first: invalid sessions typically 302 to /login, which is
+            # visible from the final URL without downloading any body
+            try:
+                response = self.session.head(test_url, timeout=10, allow_redirects=True)
+                if 'login' in response.url.lower():
+                    return False
+                if response.status_code != 405:
+                    return response.ok
+            except requests.exceptions.RequestException:
+                pass
+
+            # Fall back to a full GET when the server doesn't honour HEAD
             response = self.session.get(test_url, timeout=10, allow_redirects=True)
-            
+
             # Check if redirected to login
             if 'login' in response.url.lower():
                 return False
-            
+
             # Check for logout indicator
-            return has_logout_indicator(response.text)
-        
+            body = response.text
+            return has_logout_indicator(body)
+
         except:
             return False
     
@@ -499,7 +758,8 @@ class Authenticator:
         """
         try:
             response = self.session.get(url, timeout=10)
-            token = extract_csrf_token(response.text, self.session.cookies.get_dict())
+            body = response.text
+            token = extract_csrf_token(body, self.session.cookies.get_dict())
             if token:
                 self.csrf_token = token
             return token
@@ -1,45 +1,184 @@
 """
 Authenticated Crawler Module - Discover authenticated pages
 """
+import asyncio
+import re
+import time
+from collections import deque, OrderedDict
+from http.cookies import SimpleCookie
 from typing import Set, List, Optional
-from urllib.parse import urlparse, urljoin
+from urllib.parse import urljoin
+
+import aiohttp
 import requests
-from bs4 import BeautifulSoup
-import time
+from requests.cookies import create_cookie
+from lxml import html as lhtml
+
+# Optional: Bloom-filter dedup keeps memory flat on very large crawls
+try:
+    from pybloom_live import ScalableBloomFilter
+except ImportError:
+    ScalableBloomFilter = None
 
 from utils.forms import extract_links
 from utils.helpers import (
-    is_same_domain, is_logout_url, is_static_resource,
-    normalize_url, clean_url
+    canonicalize, extract_domain, is_logout_url, is_static_resource,
+    normalize_url
 )
 
+# Tokens for page fingerprinting; word-level is robust against markup noise
+_SIMHASH_TOKEN = re.compile(r'\w+')
+# Only the first chunk of a page feeds the fingerprint - templated pages
+# diverge (or don't) well before this point
+_SIMHASH_PREFIX = 32_000
+
+# Cap on how much of a response body is read; link extraction doesn't
+# benefit from pathological multi-megabyte pages
+_MAX_BODY_BYTES = 1024 * 1024
+
+# Cheap login-page hint; rules out the common (authenticated) case before
+# any HTML parse
+_LOGIN_HINT = re.compile(r'type=["\']?password', re.IGNORECASE)
+
+
+def _simhash(text: str) -> int:
+    """
+    64-bit SimHash of a page body
+
+    Near-identical pages (same template, different session token or
+    timestamp) produce fingerprints within a few bits of each other, so a
+    small Hamming distance identifies them without a byte-level diff.
+    """
+    weights = [0] * 64
+    for token in _SIMHASH_TOKEN.findall(text[:_SIMHASH_PREFIX]):
+        h = hash(token) & 0xFFFFFFFFFFFFFFFF
+        for bit in range(64):
+            if h & (1 << bit):
+                weights[bit] += 1
+            else:
+                weights[bit] -= 1
+    fingerprint = 0
+    for bit in range(64):
+        if weights[bit] > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+class SeenSet:
+    """
+    URL membership tracker for crawl dedup
+
+    Plain Python sets store the full URL string (~75 bytes each), which
+    adds up on 100k+ URL crawls. When pybloom_live is installed, URLs go
+    into a scalable Bloom filter (a few bytes per URL, tunable false
+    positive rate) with a small exact LRU of recent URLs in front of it.
+    Falls back to a plain set otherwise. Supports `in`, `add` and `len`.
+    """
+
+    def __init__(self, initial_capacity: int = 10_000,
+                 error_rate: float = 1e-4, lru_size: int = 1024):
+        self._count = 0
+        if ScalableBloomFilter is not None:
+            self._bloom = ScalableBloomFilter(
+                initial_capacity=initial_capacity, error_rate=error_rate)
+            self._recent = OrderedDict()
+            self._lru_size = lru_size
+            self._set = None
+        else:
+            self._bloom = None
+            self._set = set()
+
+    def add(self, url: str):
+        if self._set is not None:
+            if url not in self._set:
+                self._set.add(url)
+                self._count += 1
+            return
+        if not self._bloom.add(url):
+            self._count += 1
+        self._recent[url] = None
+        self._recent.move_to_end(url)
+        if len(self._recent) > self._lru_size:
+            self._recent.popitem(last=False)
+
+    def __contains__(self, url: str) -> bool:
+        if self._set is not None:
+            return url in self._set
+        if url in self._recent:
+            return True
+        return url in self._bloom
+
+    def __len__(self) -> int:
+        return self._count
+
+
+class TokenBucket:
+    """
+    Async token bucket rate limiter
+
+    Refills at `rate` tokens per second (monotonic clock) up to `capacity`;
+    acquire() consumes one token, sleeping until one is available. Gives a
+    steady request rate with small bursts instead of a fixed inter-request
+    sleep.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity,
+                                  self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
 
 class AuthenticatedCrawler:
     """Crawl authenticated pages while maintaining session"""
-    
-    def __init__(self, session: requests.Session, base_url: str, 
-                 max_depth: int = 2, max_pages: int = 50, logger=None):
+
+    def __init__(self, session: requests.Session, base_url: str,
+                 max_depth: int = 2, max_pages: int = 50, logger=None,
+                 concurrency: int = 10, rate: float = 5.0):
         """
         Initialize crawler
-        
+
         Args:
             session: Authenticated requests.Session
             base_url: Base URL to start crawling from
             max_depth: Maximum crawl depth
             max_pages: Maximum number of pages to crawl
             logger: Logger instance
+            concurrency: Maximum in-flight requests
+            rate: Steady-state requests per second
         """
         self.session = session
         self.base_url = base_url
-        self.base_domain = urlparse(base_url).netloc
+        # Lowercased to match canonicalize() output
+        self.base_domain = extract_domain(base_url).lower()
         self.max_depth = max_depth
         self.max_pages = max_pages
         self.logger = logger
-        
-        self.visited: Set[str] = set()
+        self.concurrency = concurrency
+        self.rate = rate
+
+        self.visited = SeenSet()
         self.discovered: Set[str] = set()
-        self.to_visit: List[tuple] = [(base_url, 0)]  # (url, depth)
-    
+        self.to_visit = deque([(base_url, 0)])  # (url, depth)
+        # Every URL ever enqueued - O(1) dedup instead of scanning the queue
+        self.queued = SeenSet()
+        self.queued.add(base_url)
+        # SimHash fingerprints of recent pages for near-duplicate skipping
+        self._page_hashes = deque(maxlen=256)
+
     def _log(self, level: str, message: str):
         """Internal logging helper"""
         if self.logger:
@@ -49,149 +188,269 @@ class AuthenticatedCrawler:
                 self.logger.success(message)
             elif level == "warning":
                 self.logger.warning(message)
-    
+
     def crawl(self) -> List[str]:
         """
         Start crawling and return discovered URLs
-        
+
         Returns:
             List of discovered authenticated URLs
         """
         self._log("info", f"Starting authenticated crawl from {self.base_url}")
         self._log("info", f"Max depth: {self.max_depth}, Max pages: {self.max_pages}")
-        
-        while self.to_visit and len(self.visited) < self.max_pages:
-            url, depth = self.to_visit.pop(0)
-            
-            # Skip if already visited
-            if url in self.visited:
-                continue
-            
-            # Skip if max depth exceeded
-            if depth > self.max_depth:
-                continue
-            
-            # Skip logout URLs
-            if is_logout_url(url):
-                self._log("warning", f"Skipping logout URL: {url}")
-                continue
-            
-            # Skip static resources
-            if is_static_resource(url):
-                continue
-            
-            # Crawl this page
-            self._crawl_page(url, depth)
-            
-            # Rate limiting
-            time.sleep(0.5)
-        
+
+        asyncio.run(self._crawl_async())
+
         self._log("success", f"Crawling complete. Discovered {len(self.discovered)} URLs")
-        
+
         return list(self.discovered)
-    
-    def _crawl_page(self, url: str, depth: int):
+
+    async def _crawl_async(self):
+        """
+        Depth-wave BFS: all pages at one depth are fetched concurrently,
+        their links seed the next wave. The crawl is I/O-bound, so having
+        a whole wave in flight bounds wall time by RTT, not page count.
+        """
+        # Cap in-flight requests and smooth the request rate; both replace
+        # the old fixed inter-page sleep. Rate limits are per host: the
+        # politeness budget protects each server individually, so a
+        # multi-host scope (manual URLs) crawls hosts in parallel instead
+        # of serializing them behind one global bucket.
+        self._sem = asyncio.Semaphore(self.concurrency)
+        self._host_buckets = {}
+
+        # Carry the authenticated state into the aiohttp session with
+        # domain/path scoping intact: a flattened get_dict() would make
+        # aiohttp treat every cookie as shared, leaking session cookies
+        # to other hosts on a multi-host (manual-URL) crawl. unsafe=True
+        # matches requests' behavior of accepting cookies from targets
+        # addressed by bare IP, common in authorized test scopes.
+        jar = aiohttp.CookieJar(unsafe=True)
+        for cookie in self.session.cookies:
+            morsel = SimpleCookie()
+            morsel[cookie.name] = cookie.value
+            if cookie.domain:
+                morsel[cookie.name]['domain'] = cookie.domain
+            if cookie.path:
+                morsel[cookie.name]['path'] = cookie.path
+            jar.update_cookies(morsel)
+        headers = dict(self.session.headers)
+        timeout = aiohttp.ClientTimeout(total=10)
+        # Keep-alive pool shared by the whole crawl: connections persist
+        # between waves so each fetch after the first skips the TCP/TLS
+        # handshake
+        connector = aiohttp.TCPConnector(limit=64, limit_per_host=16,
+                                         keepalive_timeout=30)
+
+        async with aiohttp.ClientSession(cookie_jar=jar, headers=headers,
+                                         timeout=timeout,
+                                         connector=connector) as client:
+            while self.to_visit and len(self.visited) < self.max_pages:
+                # Pull the next wave of crawlable URLs
+                wave = []
+                budget = self.max_pages - len(self.visited)
+
+                while self.to_visit and len(wave) < budget:
+                    url, depth = self.to_visit.popleft()
+                    if url in self.visited:
+                        continue
+                    if depth > self.max_depth:
+                        continue
+                    if is_logout_url(url):
+                        self._log("warning", f"Skipping logout URL: {url}")
+                        continue
+                    if is_static_resource(url):
+                        continue
+                    wave.append((url, depth))
+
+                if not wave:
+                    break
+
+                await asyncio.gather(
+                    *[self._crawl_page(client, url, depth)
+                      for url, depth in self._round_robin(wave)]
+                )
+
+        # Propagate cookies set during the crawl (session rotation,
+        # refreshed CSRF cookies) back into the shared requests.Session,
+        # so the scan phase doesn't run on stale authentication state
+        for morsel in jar:
+            self.session.cookies.set_cookie(create_cookie(
+                name=morsel.key, value=morsel.value,
+                domain=morsel['domain'], path=morsel['path'] or '/'))
+
+    def _bucket_for(self, url: str) -> TokenBucket:
+        """Per-host token bucket, created on first request to the host"""
+        host = extract_domain(url)
+        bucket = self._host_buckets.get(host)
+        if bucket is None:
+            bucket = self._host_buckets[host] = TokenBucket(self.rate)
+        return bucket
+
+    @staticmethod
+    def _round_robin(wave):
+        """
+        Interleave a wave's URLs across hosts
+
+        With per-host rate limits, launching a host's URLs back to back
+        would queue them all on the same bucket while the semaphore slots
+        sit idle; alternating hosts keeps every bucket draining.
+        """
+        by_host = OrderedDict()
+        for url, depth in wave:
+            by_host.setdefault(extract_domain(url), deque()).append((url, depth))
+        while by_host:
+            for host in list(by_host):
+                yield by_host[host].popleft()
+                if not by_host[host]:
+                    del by_host[host]
+
+    async def _crawl_page(self, client: aiohttp.ClientSession, url: str, depth: int):
         """
         Crawl a single page and extract links
-        
+
         Args:
+            client: Shared aiohttp session
             url: URL to crawl
             depth: Current depth
         """
         try:
             self._log("info", f"Crawling [{depth}]: {url}")
-            
-            response = self.session.get(url, timeout=10, allow_redirects=True)
-            
+
+            async with self._sem:
+                await self._bucket_for(url).acquire()
+                async with client.get(url, allow_redirects=True) as response:
+                    final_url = str(response.url)
+                    content_type = response.headers.get('Content-Type', '')
+
+                    # Headers arrive before the body: bail on non-HTML
+                    # responses (images, bundles, PDFs) without downloading
+                    # them, and cap how much of an HTML body is read
+                    if 'text/html' not in content_type:
+                        self.visited.add(url)
+                        return
+                    raw = await response.content.read(_MAX_BODY_BYTES)
+                    try:
+                        body = raw.decode(response.get_encoding(),
+                                          errors='replace')
+                    except (LookupError, RuntimeError):
+                        body = raw.decode('utf-8', errors='replace')
+
             # Mark as visited
             self.visited.add(url)
-            
+
             # Check if we're still authenticated
-            if self._is_login_redirect(response):
+            if self._is_login_redirect(final_url, body):
                 self._log("warning", "Session expired or redirected to login")
                 return
-            
+
             # Add to discovered URLs
             self.discovered.add(url)
-            
-            # Extract links if HTML response
-            if 'text/html' in response.headers.get('Content-Type', ''):
-                links = extract_links(response.text, url)
-                
-                # Filter and add new links
-                for link in links:
-                    if self._should_crawl(link):
-                        clean_link = clean_url(link)
-                        if clean_link not in self.visited and clean_link not in [u for u, d in self.to_visit]:
-                            self.to_visit.append((clean_link, depth + 1))
-        
-        except requests.exceptions.RequestException as e:
+
+            # Near-duplicate check: templated pages that differ only by
+            # a session token or timestamp land within a few bits of an
+            # earlier fingerprint. Keep the URL as discovered but don't
+            # expand its links - they mirror the original's.
+            fingerprint = _simhash(body)
+            if any((fingerprint ^ h).bit_count() <= 3
+                   for h in self._page_hashes):
+                self._log("info", f"Skipping near-duplicate page: {url}")
+                return
+            self._page_hashes.append(fingerprint)
+
+            links = extract_links(body, url)
+
+            # Filter and add new links
+            for link in links:
+                # Canonicalize once; the parsed result is cached and
+                # doubles as fragment-stripping/cleanup
+                clean_link, parsed = canonicalize(link)
+                if not clean_link:
+                    continue
+                if self._should_crawl(clean_link, parsed):
+                    if clean_link not in self.visited and clean_link not in self.queued:
+                        self.queued.add(clean_link)
+                        self.to_visit.append((clean_link, depth + 1))
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
             self._log("warning", f"Error crawling {url}: {str(e)}")
         except Exception as e:
             self._log("warning", f"Unexpected error crawling {url}: {str(e)}")
-    
-    def _should_crawl(self, url: str) -> bool:
+
+    def _should_crawl(self, url: str, parsed=None) -> bool:
         """
         Determine if URL should be crawled
-        
+
         Args:
-            url: URL to check
-        
+            url: URL to check (canonical form)
+            parsed: Pre-parsed SplitResult from canonicalize()
+
         Returns:
             True if should crawl
         """
+        if parsed is None:
+            url, parsed = canonicalize(url)
+            if not url:
+                return False
+
         # Must be same domain
-        if not is_same_domain(url, self.base_url):
+        if parsed.netloc != self.base_domain:
             return False
-        
+
         # Skip logout URLs
         if is_logout_url(url):
             return False
-        
+
         # Skip static resources
         if is_static_resource(url):
             return False
-        
+
         # Skip javascript: and mailto: links
         if url.startswith(('javascript:', 'mailto:', 'tel:', '#')):
             return False
-        
+
         return True
-    
-    def _is_login_redirect(self, response: requests.Response) -> bool:
+
+    def _is_login_redirect(self, final_url: str, body: str) -> bool:
         """
         Check if response is a redirect to login page
-        
+
         Args:
-            response: HTTP response
-        
+            final_url: URL after redirects
+            body: Response body text
+
         Returns:
             True if redirected to login
         """
         # Check URL
-        if 'login' in response.url.lower():
+        if 'login' in final_url.lower():
             return True
-        
-        # Check for login form in content
+
+        # Almost every crawled page is a negative here; a raw string scan
+        # settles those without building a parse tree
+        if not _LOGIN_HINT.search(body):
+            return False
+
+        # Confirm login form in content (lxml: C parser, single XPath)
         try:
-            soup = BeautifulSoup(response.text, 'html.parser')
-            password_inputs = soup.find_all('input', {'type': 'password'})
-            if password_inputs:
+            tree = lhtml.fromstring(body)
+            if tree.xpath('//input[@type="password"]'):
                 return True
-        except:
+        except Exception:
             pass
-        
+
         return False
-    
+
     def add_manual_urls(self, urls: List[str]):
         """
         Add manually specified URLs to crawl list
-        
+
         Args:
             urls: List of URLs to add
         """
         for url in urls:
             normalized = normalize_url(url, self.base_url)
-            if normalized and normalized not in self.visited:
+            if normalized and normalized not in self.visited and normalized not in self.queued:
+                self.queued.add(normalized)
                 self.to_visit.append((normalized, 0))
                 self._log("info", f"Added manual URL: {normalized}")
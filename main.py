@@ -77,7 +77,39 @@ For authorized testing only. Use responsibly.
         metavar='N',
         help='Maximum pages to crawl (default: 50)'
     )
-    
+
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=8,
+        metavar='N',
+        help='Concurrent scan threads (default: 8)'
+    )
+
+    parser.add_argument(
+        '--detector-workers',
+        type=int,
+        default=0,
+        metavar='N',
+        help='Worker processes for response analysis (default: 0, in-process)'
+    )
+
+    parser.add_argument(
+        '--max-concurrency',
+        type=int,
+        default=10,
+        metavar='N',
+        help='Maximum concurrent crawl requests (default: 10)'
+    )
+
+    parser.add_argument(
+        '--rate',
+        type=float,
+        default=5.0,
+        metavar='N',
+        help='Maximum requests per second per host (default: 5.0)'
+    )
+
     return parser.parse_args()
 
 
@@ -251,7 +283,9 @@ def main():
             base_url=user_input['base_url'],
             max_depth=args.max_depth,
             max_pages=args.max_pages,
-            logger=logger
+            logger=logger,
+            concurrency=args.max_concurrency,
+            rate=args.rate
         )
         
         # Add manual URLs to crawler if provided
@@ -280,7 +314,10 @@ def main():
     scanner = XSSScanner(
         session=session,
         logger=logger,
-        use_advanced_payloads=args.advanced
+        use_advanced_payloads=args.advanced,
+        detector_workers=args.detector_workers,
+        workers=args.workers,
+        rate=args.rate
     )
     
     vulnerabilities = scanner.scan_urls(urls_to_test)
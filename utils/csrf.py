@@ -1,68 +1,115 @@
 """
 CSRF Token Extraction Module
 """
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from typing import Optional, Dict
 import re
 
+# lxml's C parser builds the same tree 5-10x faster than the pure-Python
+# html.parser; fall back when it isn't installed
+try:
+    import lxml  # noqa: F401
+    _PARSER = 'lxml'
+except ImportError:
+    _PARSER = 'html.parser'
 
-def extract_csrf_token(html_content: str, session_cookies: Dict = None) -> Optional[str]:
+# Common CSRF token field names, in priority order
+_CSRF_FIELDS = (
+    'csrf_token',
+    'csrf',
+    '_csrf',
+    'csrf-token',
+    'csrfmiddlewaretoken',
+    'authenticity_token',
+    '_token',
+    'token',
+    'xsrf_token',
+    'xsrf-token'
+)
+
+# O(1) membership check for lowercased candidate names
+_CSRF_SET = frozenset(_CSRF_FIELDS)
+
+# Token extraction only inspects these tags; restricting the parse to
+# them skips tree construction for the rest of the page
+_CSRF_STRAINER = SoupStrainer(['input', 'meta', 'script'])
+
+# One combined pattern for JS assignments like `csrf_token = "..."`, so
+# each <script> is scanned once instead of once per field name
+_CSRF_JS_RE = re.compile(
+    r'(?:' + '|'.join(re.escape(name) for name in _CSRF_FIELDS) +
+    r')\s*[:=]\s*["\']([^"\']+)["\']',
+    re.I
+)
+
+
+def _first_by_priority(tags, value_attr: str) -> Optional[str]:
+    """
+    Pick the CSRF value from candidate tags in field-priority order
+
+    Collects name -> value from a single pass over the tags, then walks
+    _CSRF_FIELDS so e.g. csrf_token still wins over a generic token.
+    """
+    found = {}
+    for tag in tags:
+        name = tag.get('name', '').lower()
+        if name in _CSRF_SET and tag.get(value_attr) and name not in found:
+            found[name] = tag.get(value_attr)
+    if found:
+        for field_name in _CSRF_FIELDS:
+            if field_name in found:
+                return found[field_name]
+    return None
+
+
+def extract_csrf_token(html_content: str, session_cookies: Dict = None,
+                       soup: Optional[BeautifulSoup] = None) -> Optional[str]:
     """
     Extract CSRF token from HTML content
-    
+
     Checks multiple common patterns:
     - Hidden input fields (csrf_token, _csrf, authenticity_token, etc.)
     - Meta tags
     - JavaScript variables
+
+    Callers that already parsed the page can pass their soup to avoid
+    a redundant parse.
     """
-    soup = BeautifulSoup(html_content, 'html.parser')
-    
-    # Common CSRF token field names
-    csrf_field_names = [
-        'csrf_token',
-        'csrf',
-        '_csrf',
-        'csrf-token',
-        'csrfmiddlewaretoken',
-        'authenticity_token',
-        '_token',
-        'token',
-        'xsrf_token',
-        'xsrf-token'
-    ]
-    
-    # 1. Check hidden input fields
-    for field_name in csrf_field_names:
-        # Case-insensitive search
-        token_input = soup.find('input', {'name': re.compile(f'^{field_name}$', re.I)})
-        if token_input and token_input.get('value'):
-            return token_input.get('value')
-    
+    if soup is None:
+        soup = BeautifulSoup(html_content, _PARSER,
+                             parse_only=_CSRF_STRAINER)
+
+    # 1. Check hidden input fields: one tree walk collecting candidates,
+    # then resolve in field-priority order - instead of one full walk
+    # per field name
+    token = _first_by_priority(soup.find_all('input', attrs={'name': True}),
+                               'value')
+    if token is not None:
+        return token
+
     # 2. Check meta tags
-    for field_name in csrf_field_names:
-        meta_tag = soup.find('meta', {'name': re.compile(f'^{field_name}$', re.I)})
-        if meta_tag and meta_tag.get('content'):
-            return meta_tag.get('content')
-    
+    token = _first_by_priority(soup.find_all('meta', attrs={'name': True}),
+                               'content')
+    if token is not None:
+        return token
+
     # 3. Check JavaScript variables (common pattern)
+    # Look for patterns like: var csrf_token = "...";
     script_tags = soup.find_all('script')
     for script in script_tags:
         script_content = script.string
         if script_content:
-            # Look for patterns like: var csrf_token = "...";
-            for field_name in csrf_field_names:
-                pattern = rf'{field_name}\s*[:=]\s*["\']([^"\']+)["\']'
-                match = re.search(pattern, script_content, re.I)
-                if match:
-                    return match.group(1)
-    
+            match = _CSRF_JS_RE.search(script_content)
+            if match:
+                return match.group(1)
+
     # 4. Check cookies for CSRF token
     if session_cookies:
-        for field_name in csrf_field_names:
+        for field_name in _CSRF_FIELDS:
             for cookie_name, cookie_value in session_cookies.items():
-                if field_name.lower() in cookie_name.lower():
+                if field_name in cookie_name.lower():
                     return cookie_value
-    
+
     return None
 
 
@@ -71,21 +118,16 @@ def extract_all_csrf_data(html_content: str, session_cookies: Dict = None) -> Di
     Extract all potential CSRF-related fields
     Returns dict with field_name: value
     """
-    soup = BeautifulSoup(html_content, 'html.parser')
+    soup = BeautifulSoup(html_content, _PARSER,
+                         parse_only=_CSRF_STRAINER)
     csrf_data = {}
-    
-    csrf_field_names = [
-        'csrf_token', 'csrf', '_csrf', 'csrf-token',
-        'csrfmiddlewaretoken', 'authenticity_token',
-        '_token', 'token', 'xsrf_token', 'xsrf-token'
-    ]
-    
-    # Extract all hidden inputs that might be CSRF tokens
-    for field_name in csrf_field_names:
-        token_input = soup.find('input', {'name': re.compile(f'^{field_name}$', re.I)})
-        if token_input and token_input.get('value'):
-            csrf_data[token_input.get('name')] = token_input.get('value')
-    
+
+    # Extract all hidden inputs that might be CSRF tokens (single walk)
+    for token_input in soup.find_all('input', attrs={'name': True}):
+        name = token_input.get('name', '')
+        if name.lower() in _CSRF_SET and token_input.get('value'):
+            csrf_data.setdefault(name, token_input.get('value'))
+
     return csrf_data
 
 
@@ -104,15 +146,14 @@ def extract_csrf_from_form(form_element) -> Optional[tuple]:
     Extract CSRF token from a specific form element
     Returns (field_name, token_value) or None
     """
-    csrf_field_names = [
-        'csrf_token', 'csrf', '_csrf', 'csrf-token',
-        'csrfmiddlewaretoken', 'authenticity_token',
-        '_token', 'token', 'xsrf_token', 'xsrf-token'
-    ]
-    
-    for field_name in csrf_field_names:
-        token_input = form_element.find('input', {'name': re.compile(f'^{field_name}$', re.I)})
-        if token_input and token_input.get('value'):
-            return (token_input.get('name'), token_input.get('value'))
-    
+    found = {}
+    for token_input in form_element.find_all('input', attrs={'name': True}):
+        name = token_input.get('name', '')
+        if name.lower() in _CSRF_SET and token_input.get('value') \
+                and name.lower() not in found:
+            found[name.lower()] = (name, token_input.get('value'))
+    for field_name in _CSRF_FIELDS:
+        if field_name in found:
+            return found[field_name]
+
     return None
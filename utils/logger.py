@@ -1,9 +1,19 @@
 """
 Logger Module - Professional output formatting
 """
+import atexit
+import os
+import queue
+import re
+import sys
+import threading
 from datetime import datetime
 from typing import Optional
 
+# Strips ANSI color codes in one pass when a colored block needs a
+# plain-text twin for the output file
+_ANSI_RE = re.compile(r'\x1b\[[0-9;]*m')
+
 
 class Colors:
     """ANSI color codes for terminal output"""
@@ -18,26 +28,10 @@ class Colors:
     UNDERLINE = '\033[4m'
 
 
-class Logger:
-    """Professional logging with color and structure"""
-    
-    def __init__(self, output_file: Optional[str] = None):
-        self.output_file = output_file
-        
-    def _log(self, message: str, color: str = "", to_file: bool = True):
-        """Internal logging method"""
-        colored_msg = f"{color}{message}{Colors.ENDC}" if color else message
-        print(colored_msg)
-        
-        if to_file and self.output_file:
-            with open(self.output_file, 'a') as f:
-                # Strip color codes for file
-                clean_msg = message
-                f.write(f"{clean_msg}\n")
-    
-    def banner(self):
-        """Display tool banner"""
-        banner = f"""
+# One-off display blocks, formatted and UTF-8 encoded at import; writing
+# the bytes straight to the stdout buffer skips re-encoding and print's
+# newline handling on every call
+_BANNER_BYTES = f"""
 {Colors.BOLD}{Colors.OKCYAN}
 ╔═══════════════════════════════════════════════════════════╗
 ║                      XSS-HUNTER                          ║
@@ -45,98 +39,226 @@ class Logger:
 ║                  Author: dark_hunter                     ║
 ╚═══════════════════════════════════════════════════════════╝
 {Colors.ENDC}
+""".encode('utf-8') + b'\n'
+
+_ETHICAL_BYTES = f"""
+{Colors.BOLD}{Colors.WARNING}⚠️  ETHICAL USE WARNING ⚠️{Colors.ENDC}
+
+This tool is for {Colors.BOLD}AUTHORIZED TESTING ONLY{Colors.ENDC}.
+
+By using this tool, you agree that:
+  • You have explicit permission to test the target
+  • You will not use destructive payloads
+  • You will not cause account lockouts or data deletion
+  • You accept full responsibility for your actions
+
+{Colors.FAIL}Unauthorized access to computer systems is illegal.{Colors.ENDC}
+""".encode('utf-8') + b'\n'
+
+
+class Logger:
+    """Professional logging with color and structure"""
+
+    # Userspace write buffer: many small log lines coalesce into one
+    # large write() at the syscall boundary
+    BUFFER_SIZE = 1 << 16
+    # Buffered records are pushed to disk at least this often even when
+    # the buffer never fills
+    FLUSH_INTERVAL = 30.0
+
+    # Templates are assembled once at class definition; per-call work is
+    # then a single .format (or nothing at all)
+    _XSS_TMPL = f"""
+{Colors.BOLD}{Colors.OKGREEN}[+] XSS FOUND{Colors.ENDC}
+{Colors.BOLD}URL:{Colors.ENDC} {{url}}
+{Colors.BOLD}Method:{Colors.ENDC} {{method}}
+{Colors.BOLD}Parameter:{Colors.ENDC} {{parameter}}
+{Colors.BOLD}Payload:{Colors.ENDC} {{payload}}
+{Colors.BOLD}Type:{Colors.ENDC} {{xss_type}}"""
+
+    _XSS_CONTEXT_TMPL = f"\n{Colors.BOLD}Context:{Colors.ENDC} {{context}}"
+
+    _RULE = "\n" + "=" * 60
+
+    _SUMMARY_TMPL = f"""
+{Colors.BOLD}{Colors.HEADER}
+╔═══════════════════════════════════════════════════════════╗
+║                    SCAN SUMMARY                          ║
+╚═══════════════════════════════════════════════════════════╝
+{Colors.ENDC}
+{Colors.BOLD}URLs Tested:{Colors.ENDC} {{urls_tested}}
+{Colors.BOLD}Parameters Tested:{Colors.ENDC} {{params_tested}}
+{Colors.BOLD}XSS Vulnerabilities Found:{Colors.ENDC} {{xss_found}}
 """
-        print(banner)
+
+    def __init__(self, output_file: Optional[str] = None):
+        self.output_file = output_file
+        # File writes go through a queue drained by a background thread,
+        # so logging from the crawl/scan hot path (including coroutines)
+        # never blocks on disk I/O
+        self._queue = None
+        self._writer = None
+        self._fh = None
+        # Per-level (colored prefix, suffix, plain prefix), computed once
+        # so each log call is plain concatenation instead of rebuilding
+        # the color wrapping. Colors are dropped entirely when stdout is
+        # not a terminal (piped/redirected output).
+        use_color = sys.stdout.isatty()
+        endc = Colors.ENDC if use_color else ''
+        self._fmt = {
+            level: (color + tag if use_color else tag, endc, tag)
+            for level, color, tag in (
+                ('info', Colors.OKBLUE, '[*] '),
+                ('success', Colors.OKGREEN, '[+] '),
+                ('warning', Colors.WARNING, '[!] '),
+                ('error', Colors.FAIL, '[-] '),
+            )
+        }
+        self._findings_fd = None
+        if output_file:
+            # One persistent append handle instead of an open/close
+            # syscall pair per log line
+            self._fh = open(output_file, 'a', encoding='utf-8',
+                            buffering=self.BUFFER_SIZE)
+            # Findings are high-value and low-volume: a dedicated
+            # write-through fd (O_APPEND makes each write an atomic
+            # append) means no confirmed XSS is ever lost in a buffer
+            # if the scan crashes
+            self._findings_fd = os.open(
+                output_file + '.findings',
+                os.O_WRONLY | os.O_APPEND | os.O_CREAT |
+                getattr(os, 'O_CLOEXEC', 0),
+                0o644)
+            self._queue = queue.SimpleQueue()
+            self._writer = threading.Thread(target=self._drain, daemon=True)
+            self._writer.start()
+            atexit.register(self.close)
+
+    def _drain(self):
+        """Writer thread: append queued records until sentinel
+
+        Ordinary records sit in the 64 KiB buffer until it fills or
+        FLUSH_INTERVAL elapses without traffic; records flagged urgent
+        (errors, findings) flush through immediately.
+        """
+        while True:
+            try:
+                record = self._queue.get(timeout=self.FLUSH_INTERVAL)
+            except queue.Empty:
+                self._fh.flush()
+                continue
+            if record is None:
+                return
+            # Gather whatever else is already queued and hand the whole
+            # batch to one write call - under bursty logging this turns
+            # a write per record into a write per wakeup
+            texts = [record[0]]
+            urgent = record[1]
+            stop = False
+            while True:
+                try:
+                    record = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if record is None:
+                    stop = True
+                    break
+                texts.append(record[0])
+                urgent = urgent or record[1]
+            self._fh.write(''.join(texts) if len(texts) > 1 else texts[0])
+            if urgent:
+                self._fh.flush()
+            if stop:
+                return
+
+    def _write_file(self, text: str, urgent: bool = False):
+        """Enqueue a record for the writer thread (non-blocking)"""
+        if self._queue is not None:
+            self._queue.put((text, urgent))
+
+    def close(self):
+        """Flush pending records, stop the writer thread and close the file"""
+        if self._writer is not None and self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join(timeout=5)
+        self._writer = None
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+        if self._findings_fd is not None:
+            os.close(self._findings_fd)
+            self._findings_fd = None
+
+    def _log(self, level: str, message: str, urgent: bool = False):
+        """Internal logging method"""
+        prefix, suffix, plain_prefix = self._fmt[level]
+        print(prefix + message + suffix)
+
+        if self.output_file:
+            # The plain prefix never carries color codes, so the file
+            # line needs no stripping
+            self._write_file(plain_prefix + message + '\n', urgent)
+    
+    def banner(self):
+        """Display tool banner"""
+        sys.stdout.flush()
+        sys.stdout.buffer.write(_BANNER_BYTES)
+        sys.stdout.flush()
     
     def info(self, message: str):
         """Info message"""
-        self._log(f"[*] {message}", Colors.OKBLUE)
-    
+        self._log('info', message)
+
     def success(self, message: str):
         """Success message"""
-        self._log(f"[+] {message}", Colors.OKGREEN)
-    
+        self._log('success', message)
+
     def warning(self, message: str):
         """Warning message"""
-        self._log(f"[!] {message}", Colors.WARNING)
-    
+        self._log('warning', message)
+
     def error(self, message: str):
         """Error message"""
-        self._log(f"[-] {message}", Colors.FAIL)
+        self._log('error', message, urgent=True)
     
     def xss_found(self, url: str, method: str, parameter: str, payload: str, xss_type: str, context: str = ""):
         """Report XSS vulnerability"""
-        msg = f"""
-{Colors.BOLD}{Colors.OKGREEN}[+] XSS FOUND{Colors.ENDC}
-{Colors.BOLD}URL:{Colors.ENDC} {url}
-{Colors.BOLD}Method:{Colors.ENDC} {method}
-{Colors.BOLD}Parameter:{Colors.ENDC} {parameter}
-{Colors.BOLD}Payload:{Colors.ENDC} {payload}
-{Colors.BOLD}Type:{Colors.ENDC} {xss_type}"""
-        
+        msg = self._XSS_TMPL.format(url=url, method=method,
+                                    parameter=parameter, payload=payload,
+                                    xss_type=xss_type)
+
         if context:
-            msg += f"\n{Colors.BOLD}Context:{Colors.ENDC} {context}"
-        
-        msg += "\n" + "="*60
+            msg += self._XSS_CONTEXT_TMPL.format(context=context)
+
+        msg += self._RULE
         print(msg)
-        
+
         if self.output_file:
-            clean_msg = f"""
-[+] XSS FOUND
-URL: {url}
-Method: {method}
-Parameter: {parameter}
-Payload: {payload}
-Type: {xss_type}"""
-            if context:
-                clean_msg += f"\nContext: {context}"
-            clean_msg += "\n" + "="*60
-            
-            with open(self.output_file, 'a') as f:
-                f.write(f"{clean_msg}\n")
+            # One formatting pass: the plain block is the colored one
+            # minus the escape codes, so the two can't drift apart
+            plain = _ANSI_RE.sub('', msg) + "\n"
+            self._write_file(plain, urgent=True)
+            if self._findings_fd is not None:
+                os.write(self._findings_fd, plain.encode('utf-8'))
     
     def scan_summary(self, urls_tested: int, params_tested: int, xss_found: int):
         """Display scan summary"""
-        msg = f"""
-{Colors.BOLD}{Colors.HEADER}
-╔═══════════════════════════════════════════════════════════╗
-║                    SCAN SUMMARY                          ║
-╚═══════════════════════════════════════════════════════════╝
-{Colors.ENDC}
-{Colors.BOLD}URLs Tested:{Colors.ENDC} {urls_tested}
-{Colors.BOLD}Parameters Tested:{Colors.ENDC} {params_tested}
-{Colors.BOLD}XSS Vulnerabilities Found:{Colors.ENDC} {xss_found}
-"""
+        msg = self._SUMMARY_TMPL.format(urls_tested=urls_tested,
+                                        params_tested=params_tested,
+                                        xss_found=xss_found)
         print(msg)
         
         if xss_found == 0:
             self.warning("No XSS detected with current payloads and scope")
             self.info("This does not guarantee 100% security")
-        
+
         if self.output_file:
-            clean_msg = f"""
-SCAN SUMMARY
-============
-URLs Tested: {urls_tested}
-Parameters Tested: {params_tested}
-XSS Vulnerabilities Found: {xss_found}
-"""
-            with open(self.output_file, 'a') as f:
-                f.write(f"{clean_msg}\n")
+            # Same single-pass dedup as xss_found: the file copy is the
+            # formatted block minus the escape codes
+            self._write_file(_ANSI_RE.sub('', msg) + "\n", urgent=True)
     
     def ethical_warning(self):
         """Display ethical use warning"""
-        warning = f"""
-{Colors.BOLD}{Colors.WARNING}⚠️  ETHICAL USE WARNING ⚠️{Colors.ENDC}
-
-This tool is for {Colors.BOLD}AUTHORIZED TESTING ONLY{Colors.ENDC}.
-
-By using this tool, you agree that:
-  • You have explicit permission to test the target
-  • You will not use destructive payloads
-  • You will not cause account lockouts or data deletion
-  • You accept full responsibility for your actions
-
-{Colors.FAIL}Unauthorized access to computer systems is illegal.{Colors.ENDC}
-"""
-        print(warning)
+        sys.stdout.flush()
+        sys.stdout.buffer.write(_ETHICAL_BYTES)
+        sys.stdout.flush()